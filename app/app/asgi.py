@@ -0,0 +1,25 @@
+"""
+ASGI config for app project.
+
+It exposes the ASGI callable as a module-level variable named
+``application``. Django 2.1 has no ASGI handler of its own, so the WSGI
+application is served by core.asgi.WsgiToAsgiHandler, which runs Django
+in a pool of ASGI_WORKER_THREADS threads.
+
+Run it with an ASGI server, for example:
+
+    uvicorn app.asgi:application
+"""
+
+import os
+
+from django.conf import settings
+from django.core.wsgi import get_wsgi_application
+
+from core.asgi import WsgiToAsgiHandler
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
+
+application = WsgiToAsgiHandler(
+    get_wsgi_application(), max_workers=settings.ASGI_WORKER_THREADS
+)
@@ -45,14 +45,22 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'core.middleware.NonApiMiddleware',
+]
+
+# Run by core.middleware.NonApiMiddleware for requests outside
+# API_PATH_PREFIX only, the API authenticates with tokens
+NON_API_MIDDLEWARE = [
+    'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
+API_PATH_PREFIX = '/api/'
 
 ROOT_URLCONF = 'app.urls'
 
@@ -78,6 +86,12 @@ WSGI_APPLICATION = 'app.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/2.1/ref/settings/#databases
 
+# Set DB_EXTERNAL_POOLER when connecting through a transaction pooling
+# proxy such as PgBouncer, see docs/django/django.md
+DB_EXTERNAL_POOLER = os.environ.get(
+    'DB_EXTERNAL_POOLER', 'false'
+).lower() == 'true'
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -85,9 +99,50 @@ DATABASES = {
         'NAME': os.environ.get('DB_NAME'),
         'USER': os.environ.get('DB_USER'),
         'PASSWORD': os.environ.get('DB_PASS'),
+        'PORT': os.environ.get('DB_PORT', ''),
+        # Seconds to keep a connection open between requests, 0 closes it
+        # at the end of every request
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        # Server side cursors don't survive transaction pooling
+        'DISABLE_SERVER_SIDE_CURSORS': DB_EXTERNAL_POOLER,
     }
 }
 
+# Check reused connections still work before a request uses them
+# (see core.signals)
+DB_CONN_HEALTH_CHECKS = os.environ.get(
+    'DB_CONN_HEALTH_CHECKS', 'true'
+).lower() == 'true'
+# Seconds a connection has to be idle before it is checked again
+DB_CONN_HEALTH_CHECK_IDLE = int(
+    os.environ.get('DB_CONN_HEALTH_CHECK_IDLE', 10)
+)
+
+
+# Password hashing
+# PASSWORD_HASHER picks the hasher for new hashes: "pbkdf2" (default),
+# "argon2" (needs argon2-cffi) or "bcrypt" (needs bcrypt). The others stay
+# enabled so existing hashes verify and are upgraded on the next login.
+PASSWORD_HASHER = os.environ.get('PASSWORD_HASHER', 'pbkdf2')
+PASSWORD_HASHERS_BY_NAME = {
+    'pbkdf2': 'core.hashers.TunedPBKDF2PasswordHasher',
+    'argon2': 'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'bcrypt': 'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+}
+PASSWORD_HASHERS = [PASSWORD_HASHERS_BY_NAME[PASSWORD_HASHER]] + [
+    hasher for name, hasher in PASSWORD_HASHERS_BY_NAME.items()
+    if name != PASSWORD_HASHER
+] + ['django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher']
+# PBKDF2 iterations, unset uses Django's default
+PASSWORD_HASHER_ITERATIONS = int(
+    os.environ.get('PASSWORD_HASHER_ITERATIONS', 0)
+) or None
+# Rehash outdated passwords in a background thread instead of the login
+# request (see core.hashers)
+PASSWORD_REHASH_ASYNC = os.environ.get(
+    'PASSWORD_REHASH_ASYNC', 'true'
+).lower() == 'true'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/2.1/ref/settings/#auth-password-validators
@@ -126,6 +181,107 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/2.1/howto/static-files/
 
 STATIC_URL = '/static/'
+# Collected by `manage.py collectstatic` for the web server to serve
+STATIC_ROOT = os.environ.get('STATIC_ROOT', '/vol/web/static')
+
+# Uploaded files. core.views.serve_media is only mounted with SERVE_MEDIA,
+# otherwise the web server in front serves MEDIA_URL itself
+MEDIA_URL = '/media/'
+MEDIA_ROOT = os.environ.get('MEDIA_ROOT', '/vol/web/media')
+SERVE_MEDIA = os.environ.get('SERVE_MEDIA', str(DEBUG)).lower() == 'true'
+# Seconds browsers may cache uploaded files, names are unique per upload
+MEDIA_CACHE_SECONDS = int(os.environ.get('MEDIA_CACHE_SECONDS', 31536000))
 
 # override user model with our user
 AUTH_USER_MODEL = 'core.User'
+
+# Token authentication cache (see core.authentication)
+# Number of tokens kept in each process and how long (seconds) they are
+# trusted before being looked up again. Deleting a token or deactivating a
+# user only clears the entries of the process handling it, the others
+# notice after TOKEN_CACHE_LOCAL_TTL.
+TOKEN_CACHE_MAX_SIZE = int(os.environ.get('TOKEN_CACHE_MAX_SIZE', 10000))
+TOKEN_CACHE_LOCAL_TTL = int(os.environ.get('TOKEN_CACHE_LOCAL_TTL', 5))
+# How long entries are kept in the shared cache below
+TOKEN_CACHE_TTL = int(os.environ.get('TOKEN_CACHE_TTL', 60))
+# Optional alias from CACHES to share cached tokens between processes
+TOKEN_CACHE_ALIAS = os.environ.get('TOKEN_CACHE_ALIAS')
+
+# Tag and ingredient list pagination (see recipe.pagination)
+RECIPE_PAGE_SIZE = int(os.environ.get('RECIPE_PAGE_SIZE', 100))
+RECIPE_MAX_PAGE_SIZE = int(os.environ.get('RECIPE_MAX_PAGE_SIZE', 1000))
+# Maximum number of items accepted by a single bulk create request
+RECIPE_BULK_CREATE_MAX_SIZE = int(
+    os.environ.get('RECIPE_BULK_CREATE_MAX_SIZE', 1000)
+)
+
+# Cache of rendered tag and ingredient lists (see recipe.cache), set the
+# alias to an empty string to disable it
+RECIPE_LIST_CACHE_ALIAS = os.environ.get('RECIPE_LIST_CACHE_ALIAS', 'default')
+RECIPE_LIST_CACHE_TIMEOUT = int(
+    os.environ.get('RECIPE_LIST_CACHE_TIMEOUT', 300)
+)
+# Build list responses from values_list() rows instead of serializers
+RECIPE_FAST_LIST_SERIALIZATION = os.environ.get(
+    'RECIPE_FAST_LIST_SERIALIZATION', 'true'
+).lower() == 'true'
+# Default and maximum number of tag and ingredient autocomplete results
+RECIPE_AUTOCOMPLETE_LIMIT = int(os.environ.get('RECIPE_AUTOCOMPLETE_LIMIT', 10))
+RECIPE_AUTOCOMPLETE_MAX_LIMIT = int(
+    os.environ.get('RECIPE_AUTOCOMPLETE_MAX_LIMIT', 50)
+)
+
+# Recipe images (see recipe.images)
+# Largest accepted upload in bytes
+RECIPE_IMAGE_MAX_SIZE = int(
+    os.environ.get('RECIPE_IMAGE_MAX_SIZE', 10 * 1024 * 1024)
+)
+# Largest accepted image in pixels (width * height); decoding one takes
+# about 3 bytes per pixel of worker memory
+RECIPE_IMAGE_MAX_PIXELS = int(
+    os.environ.get('RECIPE_IMAGE_MAX_PIXELS', 25 * 1000 * 1000)
+)
+# Longest side in pixels of the pre-sized variants, by name
+RECIPE_IMAGE_VARIANTS = {'small': 160, 'medium': 640, 'large': 1280}
+RECIPE_IMAGE_VARIANT_QUALITY = 85
+# Threads creating variants; disable async to create them in the request
+RECIPE_IMAGE_WORKERS = int(os.environ.get('RECIPE_IMAGE_WORKERS', 2))
+RECIPE_IMAGE_ASYNC = os.environ.get(
+    'RECIPE_IMAGE_ASYNC', 'true'
+).lower() == 'true'
+
+# Seconds a token stays valid, tokens are rotated on the next login once
+# expired; 0 keeps tokens forever
+TOKEN_EXPIRE_SECONDS = int(os.environ.get('TOKEN_EXPIRE_SECONDS', 0))
+
+# Request metrics (see core.middleware)
+# Send query count and timings of each request as a Server-Timing header
+METRICS_SERVER_TIMING = os.environ.get(
+    'METRICS_SERVER_TIMING', str(DEBUG)
+).lower() == 'true'
+# Keep per view latency histograms, served at /api/metrics/ to staff
+METRICS_HISTOGRAMS = os.environ.get(
+    'METRICS_HISTOGRAMS', 'true'
+).lower() == 'true'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        # INFO logs one JSON line with the metrics of every request
+        'core.metrics': {
+            'handlers': ['console'],
+            'level': os.environ.get('METRICS_LOG_LEVEL', 'WARNING'),
+            'propagate': False,
+        },
+    },
+}
+
+# Threads running Django when served over ASGI (see app/asgi.py); slow
+# clients are handled on the event loop and don't occupy one
+ASGI_WORKER_THREADS = int(os.environ.get('ASGI_WORKER_THREADS', 16))
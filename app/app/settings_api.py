@@ -0,0 +1,38 @@
+"""
+Lean Django settings for processes that only serve the API.
+
+Select with DJANGO_SETTINGS_MODULE=app.settings_api. The admin, sessions,
+messages, static files and templates are left out so they are never
+imported at startup; serve the admin from processes using app.settings.
+"""
+
+from app.settings import *  # noqa: F401,F403
+from app.settings import INSTALLED_APPS, MIDDLEWARE
+
+INSTALLED_APPS = [
+    app for app in INSTALLED_APPS if app not in (
+        'django.contrib.admin',
+        'django.contrib.sessions',
+        'django.contrib.messages',
+        'django.contrib.staticfiles',
+    )
+]
+
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if middleware != 'core.middleware.NonApiMiddleware'
+]
+
+ROOT_URLCONF = 'app.urls_api'
+
+# Only the browsable API renders templates
+TEMPLATES = []
+
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'core.authentication.CachedTokenAuthentication',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'rest_framework.renderers.JSONRenderer',
+    ],
+}
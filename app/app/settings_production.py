@@ -0,0 +1,30 @@
+"""
+Django settings for running the app in production.
+
+Select with DJANGO_SETTINGS_MODULE=app.settings_production; everything
+not overridden here comes from app.settings.
+"""
+
+import os
+
+from app.settings import *  # noqa: F401,F403
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+
+# Without DEBUG every query is no longer kept in connection.queries, which
+# grows memory for the lifetime of a request
+DEBUG = False
+
+ALLOWED_HOSTS = [
+    host for host in os.environ.get('DJANGO_ALLOWED_HOSTS', '').split(',')
+    if host
+]
+
+METRICS_SERVER_TIMING = os.environ.get(
+    'METRICS_SERVER_TIMING', 'false'
+).lower() == 'true'
+
+# proxy/default.conf serves MEDIA_ROOT, Django's static file view isn't
+# meant for production
+SERVE_MEDIA = os.environ.get('SERVE_MEDIA', 'false').lower() == 'true'
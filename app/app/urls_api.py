@@ -0,0 +1,22 @@
+"""API URL Configuration
+
+URLs of the API only, served on their own by the app.settings_api profile
+and included by app.urls next to the admin.
+"""
+from django.conf import settings
+from django.urls import path, include
+
+from core.views import MetricsView, serve_media
+
+
+urlpatterns = [
+    path('api/user/', include('user.urls')),
+    path('api/recipe/', include('recipe.urls')),
+    path('api/metrics/', MetricsView.as_view(), name='metrics'),
+]
+
+if settings.SERVE_MEDIA:
+    urlpatterns.append(path(
+        settings.MEDIA_URL.lstrip('/') + '<path:path>', serve_media,
+        name='media',
+    ))
@@ -0,0 +1,234 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+
+CACHE_KEY_PREFIX = 'auth-token:'
+USER_CACHE_KEY_PREFIX = 'auth-user-token:'
+
+
+class TokenCache:
+    """Bounded in-process LRU cache with a time to live for each entry"""
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value for key or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """Store value for key, evicting the least recently used entries"""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Invalidation only reaches the local caches of the process that made the
+# change, so their entries live much shorter than the shared ones
+token_cache = TokenCache(
+    max_size=getattr(settings, 'TOKEN_CACHE_MAX_SIZE', 10000),
+    ttl=getattr(settings, 'TOKEN_CACHE_LOCAL_TTL', 5),
+)
+# user id -> (token key, created) for issuing tokens on login
+user_token_cache = TokenCache(
+    max_size=getattr(settings, 'TOKEN_CACHE_MAX_SIZE', 10000),
+    ttl=getattr(settings, 'TOKEN_CACHE_LOCAL_TTL', 5),
+)
+
+
+def get_shared_cache():
+    """Return the shared cache backend for tokens, if one is configured"""
+    alias = getattr(settings, 'TOKEN_CACHE_ALIAS', None)
+    if not alias:
+        return None
+    return caches[alias]
+
+
+def invalidate_token(key, user_id=None):
+    """Drop a token from the in-process and shared caches"""
+    token_cache.delete(key)
+    if user_id is not None:
+        user_token_cache.delete(user_id)
+    shared = get_shared_cache()
+    if shared is not None:
+        shared.delete(CACHE_KEY_PREFIX + key)
+        if user_id is not None:
+            shared.delete(USER_CACHE_KEY_PREFIX + str(user_id))
+
+
+def token_expired(created):
+    """Check if a token created at `created` is past TOKEN_EXPIRE_SECONDS"""
+    if not settings.TOKEN_EXPIRE_SECONDS:
+        return False
+    age = timezone.now() - created
+    return age.total_seconds() > settings.TOKEN_EXPIRE_SECONDS
+
+
+def get_user_token(user):
+    """
+    Return the key of a valid token for the user, served from the cache
+    when possible. Expired tokens are deleted and replaced by a new one.
+    """
+    shared = get_shared_cache()
+    cache_key = USER_CACHE_KEY_PREFIX + str(user.pk)
+    cached = user_token_cache.get(user.pk)
+    if cached is None and shared is not None:
+        cached = shared.get(cache_key)
+    if cached is not None and not token_expired(cached[1]):
+        return cached[0]
+
+    token = Token.objects.get_or_create(user=user)[0]
+    if token_expired(token.created):
+        token = rotate_token(token)
+
+    cached = (token.key, token.created)
+    user_token_cache.set(user.pk, cached)
+    if shared is not None:
+        shared.set(cache_key, cached, settings.TOKEN_CACHE_TTL)
+    return token.key
+
+
+def get_cached_user_fields():
+    """Return the attnames of the user fields kept in the token cache"""
+    return [
+        field.attname for field in get_user_model()._meta.concrete_fields
+        if field.name != 'password'
+    ]
+
+
+def rotate_token(token):
+    """
+    Give an expired token a new key and creation time in place. When
+    logins race to rotate the same token only the first UPDATE matches
+    the old key; the others update nothing and return the key it set,
+    rather than creating a second token for the user.
+    """
+    Token.objects.filter(key=token.key).update(
+        key=token.generate_key(), created=timezone.now()
+    )
+    # Rotating in place sends no post_delete, drop the old key here
+    invalidate_token(token.key, token.user_id)
+    return Token.objects.get_or_create(user_id=token.user_id)[0]
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication that caches the token and its user so repeated
+    requests with the same token don't query the database.
+
+    Entries are plain dicts of the token's creation time and the user's
+    field values, leaving out the password hash, and every request builds
+    its own instances from them. The password is loaded from the database
+    if it is ever accessed.
+
+    The signal handlers in core.signals invalidate the shared cache and
+    the in-process cache of the process making the change. Other
+    processes keep trusting their own entry for up to
+    TOKEN_CACHE_LOCAL_TTL seconds, so a deleted token or deactivated user
+    is rejected everywhere after that delay. Changes that bypass signals
+    (such as queryset.update()) also wait for the shared entry to expire
+    after TOKEN_CACHE_TTL seconds, if a shared cache is configured.
+    """
+
+    def authenticate_credentials(self, key):
+        data = token_cache.get(key)
+        if data is None:
+            shared = get_shared_cache()
+            if shared is not None:
+                data = shared.get(CACHE_KEY_PREFIX + key)
+            if not self.is_valid_entry(data):
+                data = self.dump_token(self.get_token(key))
+                if shared is not None:
+                    shared.set(
+                        CACHE_KEY_PREFIX + key, data, settings.TOKEN_CACHE_TTL
+                    )
+            token_cache.set(key, data)
+
+        token = self.load_token(key, data)
+        if token_expired(token.created):
+            raise exceptions.AuthenticationFailed(_('Token has expired.'))
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(
+                _('User inactive or deleted.')
+            )
+
+        return (token.user, token)
+
+    def get_token(self, key):
+        """Fetch the token together with its user from the database"""
+        model = self.get_model()
+        try:
+            return model.objects.select_related('user').defer(
+                'user__password'
+            ).get(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+
+    def dump_token(self, token):
+        """Return the cache entry of a token loaded with its user"""
+        return {
+            'created': token.created,
+            'user': [
+                getattr(token.user, name) for name in get_cached_user_fields()
+            ],
+        }
+
+    def is_valid_entry(self, data):
+        """Check a cache entry has the layout written by dump_token()"""
+        return isinstance(data, dict) and \
+            isinstance(data.get('user'), list) and \
+            len(data['user']) == len(get_cached_user_fields()) and \
+            'created' in data
+
+    def load_token(self, key, data):
+        """Build the token and its user from a cache entry"""
+        model = self.get_model()
+        user = get_user_model().from_db(
+            model.objects.db, get_cached_user_fields(), data['user']
+        )
+        values = {'key': key, 'user_id': user.pk, 'created': data['created']}
+        fields = [field.attname for field in model._meta.concrete_fields]
+        token = model.from_db(
+            model.objects.db, fields, [values[name] for name in fields]
+        )
+        # Also caches the token on user.auth_token, like select_related()
+        token.user = user
+        return token
@@ -0,0 +1,48 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, make_password
+from django.db import connection
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2 with the iteration count of PASSWORD_HASHER_ITERATIONS. It keeps
+    the pbkdf2_sha256 algorithm name, so existing hashes still verify and
+    are rehashed to the new count on the next successful login.
+    """
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASHER_ITERATIONS or \
+            PBKDF2PasswordHasher.iterations
+
+
+rehash_executor = ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix='password-rehash'
+)
+
+
+def rehash_password(user_id, old_password, raw_password):
+    """
+    Store the password hashed with the preferred hasher, unless the
+    password changed since the outdated hash was checked
+    """
+    try:
+        get_user_model().objects.filter(
+            pk=user_id, password=old_password
+        ).update(password=make_password(raw_password))
+    finally:
+        if settings.PASSWORD_REHASH_ASYNC:
+            connection.close()
+
+
+def schedule_rehash(user, raw_password):
+    """Upgrade an outdated hash without delaying the login response"""
+    if settings.PASSWORD_REHASH_ASYNC:
+        rehash_executor.submit(
+            rehash_password, user.pk, user.password, raw_password
+        )
+    else:
+        rehash_password(user.pk, user.password, raw_password)
@@ -0,0 +1,12 @@
+"""Helpers shared by the benchmark and load test commands"""
+
+
+class Rollback(Exception):
+    """Raised to roll back the data a benchmark created"""
+
+
+def percentile(values, fraction):
+    """Return the `fraction` percentile of sorted `values`, 0 if empty"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
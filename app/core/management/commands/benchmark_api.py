@@ -0,0 +1,217 @@
+import json
+import platform
+import subprocess
+import time
+from itertools import count
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework.authtoken.models import Token
+
+from core.management.benchmark import Rollback, percentile
+from core.models import Tag, Ingredient
+
+
+PASSWORD = 'benchmark-password'
+
+
+class Command(BaseCommand):
+    """
+    Django command to benchmark the user and recipe APIs against the
+    configured database. Every size gets its own user seeded with that many
+    tags and ingredients; all data is rolled back at the end.
+    """
+    help = 'Measure throughput, latency and query counts of the API'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', type=int, nargs='+', default=[10, 1000, 100000],
+            help='Number of tags and ingredients to seed per user',
+        )
+        parser.add_argument(
+            '--requests', type=int, default=50,
+            help='Measured requests per endpoint and size',
+        )
+        parser.add_argument(
+            '--warmup', type=int, default=5,
+            help='Unmeasured requests sent before each measurement',
+        )
+        parser.add_argument(
+            '--output', help='Write the results as JSON to this file',
+        )
+        parser.add_argument(
+            '--compare', metavar='BASELINE',
+            help='JSON output of an earlier run to compare against',
+        )
+        parser.add_argument(
+            '--threshold', type=float, default=10,
+            help='Percent p50 slowdown reported as a regression',
+        )
+        parser.add_argument(
+            '--fail-on-regression', action='store_true',
+            help='Exit with an error when a regression is found',
+        )
+
+    def handle(self, *args, **options):
+        report = {'meta': self.get_meta(), 'results': []}
+        try:
+            with override_settings(ALLOWED_HOSTS=['*']), \
+                    transaction.atomic():
+                for size in options['sizes']:
+                    report['results'].extend(self.run_size(size, options))
+                raise Rollback
+        except Rollback:
+            pass
+
+        for result in report['results']:
+            self.stdout.write(
+                '{size:>7} {endpoint:<18} {throughput:>9.1f} req/s  '
+                'p50 {p50_ms:>8.2f} ms  p99 {p99_ms:>8.2f} ms  '
+                '{queries:>3} queries'.format(**result)
+            )
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, indent=2)
+
+        if options['compare']:
+            regressions = self.compare(report, options)
+            if regressions and options['fail_on_regression']:
+                raise CommandError(
+                    '{} regressions found'.format(regressions)
+                )
+
+    def get_meta(self):
+        try:
+            commit = subprocess.check_output(
+                ['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL
+            ).decode().strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {
+            'commit': commit,
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'timestamp': time.time(),
+        }
+
+    def seed(self, size):
+        """Create a user owning `size` tags and ingredients"""
+        user = get_user_model().objects.create_user(
+            email='benchmark-{}@example.com'.format(size),
+            password=PASSWORD,
+        )
+        for model in (Tag, Ingredient):
+            for start in range(0, size, 5000):
+                model.objects.bulk_create([
+                    model(user=user, name='{} {:07d}'.format(
+                        model._meta.model_name, i
+                    ))
+                    for i in range(start, min(start + 5000, size))
+                ])
+        return user, Token.objects.create(user=user)
+
+    def run_size(self, size, options):
+        user, token = self.seed(size)
+        client = Client(HTTP_AUTHORIZATION='Token ' + token.key)
+        names = count()
+
+        tags_url = reverse('recipe:tag-list')
+        ingredients_url = reverse('recipe:ingredient-list')
+        me_url = reverse('user:me')
+        token_url = reverse('user:token')
+        search_url = reverse('recipe:search')
+        # One matching row, and a word in every seeded tag name
+        rare_term = '{:07d}'.format(size // 2)
+        common_term = 'tag'
+        credentials = {'email': user.email, 'password': PASSWORD}
+
+        endpoints = [
+            ('tag-list', lambda: client.get(tags_url)),
+            ('ingredient-list', lambda: client.get(ingredients_url)),
+            ('tag-create', lambda: client.post(
+                tags_url, {'name': 'new tag {}'.format(next(names))}
+            )),
+            ('me', lambda: client.get(me_url)),
+            ('token', lambda: client.post(token_url, credentials)),
+            ('search', lambda: client.get(search_url, {'q': rare_term})),
+            ('search-common', lambda: client.get(
+                search_url, {'q': common_term}
+            )),
+        ]
+
+        results = []
+        with override_settings(RECIPE_LIST_CACHE_ALIAS=''):
+            for endpoint, request in endpoints:
+                results.append(self.measure(size, endpoint, request, options))
+        results.append(self.measure(
+            size, 'tag-list-cached', endpoints[0][1], options
+        ))
+        return results
+
+    def measure(self, size, endpoint, request, options):
+        for _ in range(options['warmup']):
+            self.check_response(endpoint, request())
+
+        latencies = []
+        queries = 0
+        start = time.perf_counter()
+        for _ in range(options['requests']):
+            with CaptureQueriesContext(connection) as captured:
+                request_start = time.perf_counter()
+                self.check_response(endpoint, request())
+                latencies.append(
+                    (time.perf_counter() - request_start) * 1000
+                )
+            queries = max(queries, len(captured))
+        elapsed = time.perf_counter() - start
+
+        latencies.sort()
+        return {
+            'size': size,
+            'endpoint': endpoint,
+            'requests': len(latencies),
+            'throughput': len(latencies) / elapsed,
+            'p50_ms': percentile(latencies, 0.5),
+            'p99_ms': percentile(latencies, 0.99),
+            'queries': queries,
+        }
+
+    def check_response(self, endpoint, response):
+        if response.status_code >= 400:
+            raise CommandError('{} failed with status {}'.format(
+                endpoint, response.status_code
+            ))
+
+    def compare(self, report, options):
+        """Print the p50 change against a baseline, return regressions"""
+        with open(options['compare']) as baseline_file:
+            baseline = {
+                (result['size'], result['endpoint']): result
+                for result in json.load(baseline_file)['results']
+            }
+
+        regressions = 0
+        for result in report['results']:
+            before = baseline.get((result['size'], result['endpoint']))
+            if before is None:
+                continue
+            change = (result['p50_ms'] / before['p50_ms'] - 1) * 100
+            regressed = change > options['threshold'] or \
+                result['queries'] > before['queries']
+            regressions += regressed
+            self.stdout.write(
+                '{:>7} {:<18} p50 {:+.1f}%  queries {} -> {}{}'.format(
+                    result['size'], result['endpoint'], change,
+                    before['queries'], result['queries'],
+                    '  REGRESSION' if regressed else '',
+                )
+            )
+        return regressions
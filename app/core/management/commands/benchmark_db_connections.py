@@ -0,0 +1,59 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.signals import request_started, request_finished
+from django.db import connections
+
+
+class Command(BaseCommand):
+    """
+    Django command to measure the database cost of a request with and
+    without persistent connections
+    """
+    help = 'Compare per request latency with CONN_MAX_AGE 0 and persistent'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument(
+            '--max-age', type=int, default=60,
+            help='CONN_MAX_AGE used for the persistent run',
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        configured = connection.settings_dict['CONN_MAX_AGE']
+        try:
+            for max_age in (0, options['max_age']):
+                connection.close()
+                connection.settings_dict['CONN_MAX_AGE'] = max_age
+                timings = self.run(connection, options['requests'])
+                self.report(max_age, timings)
+        finally:
+            connection.settings_dict['CONN_MAX_AGE'] = configured
+            connection.close()
+
+    def run(self, connection, requests):
+        """Time requests that run a single query, in milliseconds"""
+        timings = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            request_started.send(sender=self.__class__)
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+            request_finished.send(sender=self.__class__)
+            timings.append((time.perf_counter() - start) * 1000)
+        return sorted(timings)
+
+    def report(self, max_age, timings):
+        self.stdout.write(
+            'CONN_MAX_AGE={:<4} mean {:.3f} ms, p50 {:.3f} ms, '
+            'p99 {:.3f} ms'.format(
+                max_age,
+                statistics.mean(timings),
+                timings[len(timings) // 2],
+                timings[int(len(timings) * 0.99) - 1],
+            )
+        )
@@ -0,0 +1,51 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher, get_hashers
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    """
+    Django command to measure how many password checks, the CPU bound part
+    of a login, a single core can do with each configured hasher
+    """
+    help = 'Benchmark login throughput per core for the password hashers'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seconds', type=float, default=2,
+            help='How long to run each hasher',
+        )
+
+    def handle(self, *args, **options):
+        preferred = get_hasher().algorithm
+        for hasher in get_hashers():
+            try:
+                if hasher.library:
+                    hasher._load_library()
+            except ValueError:
+                self.stdout.write('{}: library not installed'.format(
+                    hasher.algorithm
+                ))
+                continue
+            rate = self.measure(hasher, options['seconds'])
+            self.stdout.write('{}{}: {:.1f} logins/s per core'.format(
+                hasher.algorithm,
+                ' (preferred)' if hasher.algorithm == preferred else '',
+                rate,
+            ))
+        self.stdout.write('PASSWORD_HASHER_ITERATIONS={}'.format(
+            settings.PASSWORD_HASHER_ITERATIONS
+        ))
+
+    def measure(self, hasher, seconds):
+        """Return password verifications per second on this thread"""
+        encoded = hasher.encode('benchmark password', hasher.salt())
+        checks = 0
+        start = time.perf_counter()
+        deadline = start + seconds
+        while time.perf_counter() < deadline:
+            hasher.verify('benchmark password', encoded)
+            checks += 1
+        return checks / (time.perf_counter() - start)
@@ -0,0 +1,86 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from rest_framework.authtoken.models import Token
+
+from core.management.benchmark import Rollback
+
+
+class Command(BaseCommand):
+    """
+    Django command to measure what the middleware stack adds to an API
+    request. The token authenticated `me` endpoint is served with no
+    middleware, with every middleware (the stack before NonApiMiddleware)
+    and with the configured MIDDLEWARE. Data is rolled back at the end.
+    """
+    help = 'Compare per request overhead of the middleware stacks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--warmup', type=int, default=50)
+
+    def handle(self, *args, **options):
+        full = []
+        for path in settings.MIDDLEWARE:
+            if path == 'core.middleware.NonApiMiddleware':
+                full.extend(settings.NON_API_MIDDLEWARE)
+            else:
+                full.append(path)
+        stacks = [
+            ('none', []),
+            ('full', full),
+            ('configured', settings.MIDDLEWARE),
+        ]
+
+        try:
+            with override_settings(ALLOWED_HOSTS=['*']), \
+                    transaction.atomic():
+                user = get_user_model().objects.create_user(
+                    email='benchmark-middleware@example.com',
+                    password='benchmark-password',
+                )
+                token = Token.objects.create(user=user)
+                baseline = None
+                for name, middleware in stacks:
+                    with override_settings(MIDDLEWARE=middleware):
+                        timings = self.run(token, options)
+                    p50 = timings[len(timings) // 2]
+                    if baseline is None:
+                        baseline = p50
+                    self.report(name, timings, p50 - baseline)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, token, options):
+        """Time requests to the me endpoint, in milliseconds"""
+        client = Client(HTTP_AUTHORIZATION='Token ' + token.key)
+        url = reverse('user:me')
+        for _ in range(options['warmup']):
+            client.get(url)
+
+        timings = []
+        for _ in range(options['requests']):
+            start = time.perf_counter()
+            client.get(url)
+            timings.append((time.perf_counter() - start) * 1000)
+        return sorted(timings)
+
+    def report(self, name, timings, overhead):
+        self.stdout.write(
+            '{:<11} mean {:.3f} ms, p50 {:.3f} ms, p99 {:.3f} ms, '
+            'middleware {:+.3f} ms'.format(
+                name,
+                statistics.mean(timings),
+                timings[len(timings) // 2],
+                timings[int(len(timings) * 0.99) - 1],
+                overhead,
+            )
+        )
@@ -0,0 +1,90 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from rest_framework.renderers import JSONRenderer
+
+from core.management.benchmark import Rollback
+from core.models import Tag, Ingredient
+from recipe.serializers import TagSerializer, IngredientSerializer
+
+
+SERIALIZERS = (
+    (Tag, TagSerializer),
+    (Ingredient, IngredientSerializer),
+)
+
+
+class Command(BaseCommand):
+    """
+    Django command to compare the list serializers against the
+    values_list() fast path used by the recipe viewsets
+    """
+    help = 'Benchmark list serialization and check both outputs match'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        # Seed inside a transaction that is always rolled back
+        try:
+            with transaction.atomic():
+                self.run(options['rows'], options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, rows, repeat):
+        user = get_user_model().objects.create_user(
+            email='benchmark@example.com'
+        )
+        renderer = JSONRenderer()
+
+        for model, serializer_class in SERIALIZERS:
+            model.objects.bulk_create(
+                model(user=user, name='{} "{}" ü\u2028'.format(
+                    model._meta.model_name, i
+                ))
+                for i in range(rows)
+            )
+            queryset = model.objects.filter(user=user).order_by('-name', '-id')
+            fields = serializer_class.Meta.fields
+
+            def serialize():
+                data = serializer_class(queryset.all(), many=True).data
+                return renderer.render(data)
+
+            def fast():
+                values = queryset.values_list(*fields, named=True)
+                return renderer.render([row._asdict() for row in values])
+
+            serialized_time, serialized = self.measure(serialize, repeat)
+            fast_time, fast_output = self.measure(fast, repeat)
+            if serialized != fast_output:
+                raise CommandError(
+                    'Output of the {} fast path differs from {}'.format(
+                        model._meta.model_name, serializer_class.__name__
+                    )
+                )
+
+            self.stdout.write(
+                '{}: {} rows, serializer {:.1f} ms, fast path {:.1f} ms '
+                '({:.1f}x), {} identical bytes'.format(
+                    model._meta.model_name, rows,
+                    serialized_time * 1000, fast_time * 1000,
+                    serialized_time / fast_time, len(fast_output),
+                )
+            )
+
+    def measure(self, func, repeat):
+        """Return the best time out of `repeat` runs and the result"""
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
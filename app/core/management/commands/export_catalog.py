@@ -0,0 +1,52 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from core.models import CATALOG_MODELS
+
+
+class Command(BaseCommand):
+    """Django command to stream tags and ingredients out as NDJSON"""
+    help = 'Export tags and ingredients as newline delimited JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', default='-',
+            help='File to write to, "-" for stdout (default)',
+        )
+        parser.add_argument(
+            '--user', action='append', dest='users', metavar='EMAIL',
+            help='Only export the catalogue of this user, can be repeated',
+        )
+        parser.add_argument(
+            '--type', action='append', dest='types', choices=CATALOG_MODELS,
+            help='Only export this kind of row, can be repeated',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=2000,
+            help='Rows fetched per round trip from the database cursor',
+        )
+
+    def handle(self, *args, **options):
+        if options['output'] == '-':
+            self.export(self.stdout, options)
+        else:
+            with open(options['output'], 'w') as output:
+                self.export(output, options)
+
+    def export(self, output, options):
+        total = 0
+        for kind in options['types'] or CATALOG_MODELS:
+            queryset = CATALOG_MODELS[kind].objects.order_by('id')
+            if options['users']:
+                queryset = queryset.filter(user__email__in=options['users'])
+            rows = queryset.values_list('user__email', 'name').iterator(
+                chunk_size=options['chunk_size']
+            )
+            for email, name in rows:
+                output.write(json.dumps(
+                    {'type': kind, 'user': email, 'name': name}
+                ) + '\n')
+                total += 1
+
+        self.stderr.write('Exported {} rows'.format(total))
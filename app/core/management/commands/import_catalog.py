@@ -0,0 +1,95 @@
+import json
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.models import CATALOG_MODELS, CollectionVersion
+
+
+class Command(BaseCommand):
+    """Django command to stream tags and ingredients in from NDJSON"""
+    help = 'Import tags and ingredients from newline delimited JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'input', nargs='?', default='-',
+            help='File to read from, "-" for stdin (default)',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Rows inserted per bulk_create',
+        )
+
+    def handle(self, *args, **options):
+        if options['input'] == '-':
+            self.load(sys.stdin, options['batch_size'])
+        else:
+            with open(options['input']) as source:
+                self.load(source, options['batch_size'])
+
+    def load(self, source, batch_size):
+        """
+        Insert rows in batches so memory stays flat for any file size. The
+        whole import is one transaction, so an invalid row leaves neither
+        rows nor collection versions of the earlier batches behind.
+        """
+        with transaction.atomic():
+            self.insert(source, batch_size)
+
+    def insert(self, source, batch_size):
+        batches = {kind: [] for kind in CATALOG_MODELS}
+        user_ids = {}
+        changed = set()
+        created = skipped = 0
+
+        for line_number, line in enumerate(source, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+                model = CATALOG_MODELS[row['type']]
+                # Same checks as a form: not null, not blank, max_length
+                email = get_user_model()._meta.get_field('email').clean(
+                    row['user'], None
+                )
+                name = model._meta.get_field('name').clean(row['name'], None)
+            except (ValueError, KeyError, TypeError, ValidationError):
+                raise CommandError(
+                    'Invalid row on line {}: {}'.format(line_number, line)
+                )
+
+            if email not in user_ids:
+                user_ids[email] = get_user_model().objects.filter(
+                    email=email
+                ).values_list('id', flat=True).first()
+            if user_ids[email] is None:
+                skipped += 1
+                continue
+
+            changed.add((user_ids[email], row['type']))
+            batch = batches[row['type']]
+            batch.append(model(user_id=user_ids[email], name=name))
+            if len(batch) >= batch_size:
+                model.objects.bulk_create(batch)
+                created += len(batch)
+                batch.clear()
+
+        for kind, batch in batches.items():
+            if batch:
+                CATALOG_MODELS[kind].objects.bulk_create(batch)
+                created += len(batch)
+
+        # bulk_create doesn't send post_save, see core.signals
+        for user_id, kind in changed:
+            CollectionVersion.objects.bump(user_id, kind, create=True)
+
+        if skipped:
+            self.stderr.write(
+                'Skipped {} rows of unknown users'.format(skipped)
+            )
+        self.stdout.write(self.style.SUCCESS(
+            'Imported {} rows'.format(created)
+        ))
@@ -0,0 +1,144 @@
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.management.benchmark import percentile
+
+
+class Command(BaseCommand):
+    """
+    Django command to load test a running server with many concurrent
+    connections. Each client can send its request slowly to simulate slow
+    networks, which ties up a WSGI worker but only a coroutine under ASGI.
+    Run it against both deployment modes to compare their concurrency
+    limits.
+    """
+    help = 'Send concurrent, optionally slow, requests to a running server'
+
+    def add_arguments(self, parser):
+        parser.add_argument('url', help='URL to request')
+        parser.add_argument(
+            '--concurrency', type=int, nargs='+', default=[1, 10, 100, 500],
+            help='Number of simultaneous connections',
+        )
+        parser.add_argument(
+            '--requests', type=int, default=5,
+            help='Requests sent by each connection',
+        )
+        parser.add_argument(
+            '--token', help='API token sent in the Authorization header',
+        )
+        parser.add_argument(
+            '--slow-client', type=float, default=0, metavar='SECONDS',
+            help='Time each client takes to send its request headers',
+        )
+        parser.add_argument(
+            '--timeout', type=float, default=30,
+            help='Seconds before a request is counted as failed',
+        )
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['url'])
+        if url.scheme != 'http' or not url.hostname:
+            raise CommandError('Only http:// URLs are supported')
+
+        for concurrency in options['concurrency']:
+            result = asyncio.get_event_loop().run_until_complete(
+                self.run(url, concurrency, options)
+            )
+            self.stdout.write(
+                '{concurrency:>5} connections  {throughput:>9.1f} req/s  '
+                'p50 {p50_ms:>8.2f} ms  p99 {p99_ms:>8.2f} ms  '
+                '{errors} errors'.format(**result)
+            )
+
+    async def run(self, url, concurrency, options):
+        latencies = []
+        errors = [0]
+        start = time.perf_counter()
+        await asyncio.gather(*[
+            self.client(url, options, latencies, errors)
+            for _ in range(concurrency)
+        ])
+        elapsed = time.perf_counter() - start
+
+        latencies.sort()
+        return {
+            'concurrency': concurrency,
+            'throughput': len(latencies) / elapsed,
+            'p50_ms': percentile(latencies, 0.5),
+            'p99_ms': percentile(latencies, 0.99),
+            'errors': errors[0],
+        }
+
+    async def client(self, url, options, latencies, errors):
+        """Send requests over one keep-alive connection"""
+        writer = None
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(
+                url.hostname, url.port or 80
+            ), options['timeout'])
+            for _ in range(options['requests']):
+                request_start = time.perf_counter()
+                status = await asyncio.wait_for(
+                    self.request(reader, writer, url, options),
+                    options['timeout'],
+                )
+                if status >= 400:
+                    errors[0] += 1
+                else:
+                    latencies.append(
+                        (time.perf_counter() - request_start) * 1000
+                    )
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError,
+                asyncio.LimitOverrunError, IndexError, ValueError):
+            # A broken connection or response counts as an error, it must
+            # not stop the other clients
+            errors[0] += 1
+        finally:
+            if writer is not None:
+                writer.close()
+
+    async def request(self, reader, writer, url, options):
+        """Send one GET request and return the response status"""
+        lines = [
+            'GET {} HTTP/1.1'.format(url.path + (
+                '?' + url.query if url.query else ''
+            ) or '/'),
+            'Host: {}'.format(url.netloc),
+            'Accept: application/json',
+        ]
+        if options['token']:
+            lines.append('Authorization: Token {}'.format(options['token']))
+        lines.append('')
+
+        delay = options['slow_client'] / len(lines)
+        for line in lines:
+            writer.write((line + '\r\n').encode('latin1'))
+            await writer.drain()
+            if delay:
+                await asyncio.sleep(delay)
+
+        status = int((await reader.readline()).split()[1])
+        length = 0
+        chunked = False
+        while True:
+            header = (await reader.readline()).strip().lower()
+            if not header:
+                break
+            if header.startswith(b'content-length:'):
+                length = int(header.split(b':', 1)[1])
+            elif header.startswith(b'transfer-encoding:') and \
+                    b'chunked' in header:
+                chunked = True
+
+        if not chunked:
+            await reader.readexactly(length)
+            return status
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if not size:
+                return status
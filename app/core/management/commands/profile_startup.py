@@ -0,0 +1,136 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# Run in a fresh interpreter: set up Django, build the WSGI application and
+# serve one request that needs no database
+FIRST_REQUEST = '''
+import json, sys, time
+start = time.perf_counter()
+import django
+from django.conf import settings
+django.setup(set_prefix=False)
+setup = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+from wsgiref.util import setup_testing_defaults
+application = get_wsgi_application()
+settings.ALLOWED_HOSTS = ['*']
+environ = {'PATH_INFO': sys.argv[1], 'HTTP_ACCEPT': 'application/json'}
+setup_testing_defaults(environ)
+status = []
+b''.join(application(environ, lambda s, h, e=None: status.append(s)))
+print(json.dumps({
+    'setup': setup - start,
+    'status': int(status[0].split()[0]),
+}))
+'''
+
+
+class Command(BaseCommand):
+    """
+    Django command to measure the cold start of settings modules: the
+    time from starting the interpreter until the first response has been
+    served, and which packages take the longest to import.
+    """
+    help = 'Profile process startup and time to first request'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'modules', nargs='*',
+            help='Settings modules to profile, defaults to the current one',
+        )
+        parser.add_argument(
+            '--path', default='/api/user/me/',
+            help='Path of the first request',
+        )
+        parser.add_argument(
+            '--runs', type=int, default=5,
+            help='Processes started per settings module, the median is used',
+        )
+        parser.add_argument(
+            '--top', type=int, default=10,
+            help='Number of slowest packages to list',
+        )
+        parser.add_argument(
+            '--target', type=float, metavar='SECONDS',
+            help='Fail when the time to first request is above this',
+        )
+
+    def handle(self, *args, **options):
+        modules = options['modules'] or [os.environ['DJANGO_SETTINGS_MODULE']]
+        slow = []
+        for module in modules:
+            runs = sorted(
+                (self.start(module, options) for _ in range(options['runs'])),
+                key=lambda run: run['total'],
+            )
+            median = runs[len(runs) // 2]
+            self.report(module, median, options)
+            if options['target'] and median['total'] > options['target']:
+                slow.append(module)
+
+        if slow:
+            raise CommandError('Time to first request above {}s: {}'.format(
+                options['target'], ', '.join(slow)
+            ))
+
+    def start(self, module, options):
+        """Serve the first request in a new process, return its timings"""
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=module)
+        start = time.perf_counter()
+        process = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', FIRST_REQUEST,
+             options['path']],
+            cwd=settings.BASE_DIR, env=env,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        )
+        total = time.perf_counter() - start
+        stderr = process.stderr.decode()
+        if process.returncode:
+            raise CommandError('Starting {} failed:\n{}'.format(
+                module, stderr[stderr.rfind('Traceback'):]
+            ))
+
+        result = json.loads(process.stdout.decode().splitlines()[-1])
+        result['total'] = total
+        result['imports'] = self.parse_importtime(stderr)
+        return result
+
+    def parse_importtime(self, output):
+        """
+        Sum the cumulative import time in seconds of the modules imported
+        outside other imports, grouped by the first three name components
+        (such as django.contrib.admin)
+        """
+        packages = defaultdict(float)
+        for line in output.splitlines():
+            if not line.startswith('import time:') or '[us]' in line:
+                continue
+            _, cumulative, name = line[len('import time:'):].split('|')
+            # Nested imports are indented and already in their parent's time
+            if name.startswith('  '):
+                continue
+            package = '.'.join(name.strip().split('.')[:3])
+            packages[package] += int(cumulative) / 1e6
+        return packages
+
+    def report(self, module, run, options):
+        self.stdout.write(
+            '{}: first request {:.3f}s (status {}), django.setup() '
+            '{:.3f}s, imports {:.3f}s'.format(
+                module, run['total'], run['status'], run['setup'],
+                sum(run['imports'].values()),
+            )
+        )
+        slowest = sorted(
+            run['imports'].items(), key=lambda item: item[1], reverse=True
+        )
+        for package, seconds in slowest[:options['top']]:
+            self.stdout.write('  {:<28} {:.3f}s'.format(package, seconds))
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F
+
+from core.models import CATALOG_MODELS, CollectionVersion, count_recipes
+
+
+class Command(BaseCommand):
+    """
+    Django command to correct usage_count of tags and ingredients. Rows
+    are checked in id ranges of --batch-size so no statement runs long,
+    and only rows whose count drifted are written. update() sends no
+    signals, so the collection versions of the owners are bumped here to
+    invalidate their cached lists and ETags.
+    """
+    help = 'Recount how many recipes use every tag and ingredient'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--type', action='append', dest='types', choices=CATALOG_MODELS,
+            help='Only recount this kind of row, can be repeated',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Rows checked per query',
+        )
+
+    def handle(self, *args, **options):
+        for kind in options['types'] or CATALOG_MODELS:
+            fixed = self.recount(CATALOG_MODELS[kind], options['batch_size'])
+            self.stdout.write('Fixed usage_count of {} {}s'.format(
+                fixed, kind
+            ))
+
+    def recount(self, model, batch_size):
+        """Return the number of rows whose usage_count was corrected"""
+        fixed = 0
+        last_id = 0
+        while True:
+            batch = list(model.objects.filter(id__gt=last_id).order_by(
+                'id'
+            ).values_list('id', flat=True)[:batch_size])
+            if not batch:
+                return fixed
+            last_id = batch[-1]
+
+            drifted = list(model.objects.filter(
+                id__gte=batch[0], id__lte=last_id,
+            ).annotate(actual=count_recipes(model)).exclude(
+                usage_count=F('actual')
+            ).values_list('id', flat=True))
+            if drifted:
+                # Count again while writing so links changed since the
+                # check are included
+                fixed += model.objects.filter(id__in=drifted).update(
+                    usage_count=count_recipes(model)
+                )
+                user_ids = model.objects.filter(id__in=drifted).values_list(
+                    'user_id', flat=True
+                ).distinct()
+                for user_id in user_ids:
+                    CollectionVersion.objects.bump(
+                        user_id, model._meta.model_name
+                    )
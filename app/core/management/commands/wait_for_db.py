@@ -1,21 +1,70 @@
+import random
 import time
 
-from django.db import connections
+from django.db import connections, DEFAULT_DB_ALIAS
 from django.db.utils import OperationalError
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 
 
 class Command(BaseCommand):
     """Django command to pause execution until database is available"""
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database', action='append', dest='databases',
+            help='Database alias to wait for, can be repeated '
+                 '(default: "default")',
+        )
+        parser.add_argument(
+            '--timeout', type=float, default=60,
+            help='Seconds to wait for all databases before failing',
+        )
+        parser.add_argument(
+            '--initial-delay', type=float, default=0.5,
+            help='Seconds to wait after the first failed attempt',
+        )
+        parser.add_argument(
+            '--max-delay', type=float, default=5,
+            help='Upper bound of the exponentially growing delay',
+        )
+
     def handle(self, *args, **options):
+        deadline = time.monotonic() + options['timeout']
+        for alias in options['databases'] or [DEFAULT_DB_ALIAS]:
+            self.wait_for(alias, deadline, options)
+
+        self.stdout.write(self.style.SUCCESS('Database available!'))
+
+    def wait_for(self, alias, deadline, options):
+        """Retry with exponential backoff and jitter until the deadline"""
         self.stdout.write('Waiting for database...')
-        db_conn = None
-        while not db_conn:
+        delay = options['initial_delay']
+        while True:
             try:
-                db_conn = connections['default']
+                self.check_database(alias)
+                return
             except OperationalError:
-                self.stdout.write('Database unavailable, waiting 1 second...')
-                time.sleep(1)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise CommandError(
+                        'Database "{}" unavailable after {} seconds'.format(
+                            alias, options['timeout']
+                        )
+                    )
+                wait = min(delay / 2 + random.uniform(0, delay / 2), remaining)
+                self.stdout.write(
+                    'Database unavailable, waiting {:.1f} seconds...'.format(
+                        wait
+                    )
+                )
+                time.sleep(wait)
+                delay = min(delay * 2, options['max_delay'])
 
-        self.stdout.write(self.style.SUCCESS('Database available!'))
+    def check_database(self, alias):
+        """Open a real connection and run a trivial query"""
+        connection = connections[alias]
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+        finally:
+            connection.close()
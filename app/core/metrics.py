@@ -0,0 +1,127 @@
+import bisect
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+
+# Upper bounds in milliseconds of the latency histogram buckets
+BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_local = threading.local()
+
+
+class RequestMetrics:
+    """Query count and time spent per phase of the current request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.timings = defaultdict(float)
+
+    def elapsed(self):
+        return (time.perf_counter() - self.started) * 1000
+
+
+def start_request():
+    _local.metrics = RequestMetrics()
+    return _local.metrics
+
+
+def end_request():
+    _local.metrics = None
+
+
+def current():
+    """Return the metrics of the request handled by this thread, if any"""
+    return getattr(_local, 'metrics', None)
+
+
+@contextmanager
+def timer(name):
+    """Add the time spent in the block to the current request's `name`"""
+    metrics = current()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.timings[name] += (time.perf_counter() - start) * 1000
+
+
+class Histogram:
+    """Cumulative latency histogram with fixed buckets"""
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        self.buckets[bisect.bisect_left(BUCKETS, value)] += 1
+
+    def as_dict(self):
+        labels = [str(bound) for bound in BUCKETS] + ['+Inf']
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 3),
+            'buckets': dict(zip(labels, self.buckets)),
+        }
+
+
+class MetricsRegistry:
+    """In-process histograms of every view's latency and query counts"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def record(self, view, status, metrics, total):
+        with self._lock:
+            stats = self._views.get(view)
+            if stats is None:
+                stats = self._views[view] = {
+                    'requests': 0,
+                    'errors': 0,
+                    'queries': 0,
+                    'total': Histogram(),
+                    'db': Histogram(),
+                    'serialize': Histogram(),
+                }
+            stats['requests'] += 1
+            stats['errors'] += status >= 500
+            stats['queries'] += metrics.queries
+            stats['total'].observe(total)
+            stats['db'].observe(metrics.timings['db'])
+            stats['serialize'].observe(metrics.timings['serialize'])
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                view: {
+                    key: value.as_dict() if isinstance(value, Histogram)
+                    else value
+                    for key, value in stats.items()
+                }
+                for view, stats in self._views.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+
+registry = MetricsRegistry()
+
+
+class TimedSerializerMixin:
+    """Serializer mixin adding the time spent in `.data` to the request"""
+
+    @property
+    def data(self):
+        with timer('serialize'):
+            return super().data
@@ -0,0 +1,160 @@
+import json
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.handlers.exception import convert_exception_to_response
+from django.db import connections
+from django.utils.module_loading import import_string
+
+from core import metrics
+
+
+logger = logging.getLogger('core.metrics')
+
+
+class RequestMetricsMiddleware:
+    """
+    Record query count, database, serializer and render time and total
+    latency of every request. They are sent as a Server-Timing header,
+    logged to the core.metrics logger and added to the in-process
+    histograms served by core.views.MetricsView.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request_metrics = metrics.start_request()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(self.record_query)
+                    )
+                response = self.get_response(request)
+            total = request_metrics.elapsed()
+            self.report(request, response, request_metrics, total)
+        finally:
+            metrics.end_request()
+        return response
+
+    def process_template_response(self, request, response):
+        """Time rendering, which happens right after this hook"""
+        start = time.perf_counter()
+        request_metrics = metrics.current()
+
+        def rendered(response):
+            request_metrics.timings['render'] += \
+                (time.perf_counter() - start) * 1000
+
+        if request_metrics is not None:
+            response.add_post_render_callback(rendered)
+        return response
+
+    def record_query(self, execute, sql, params, many, context):
+        request_metrics = metrics.current()
+        if request_metrics is None:
+            return execute(sql, params, many, context)
+        request_metrics.queries += 1
+        with metrics.timer('db'):
+            return execute(sql, params, many, context)
+
+    def report(self, request, response, request_metrics, total):
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        timings = request_metrics.timings
+
+        if settings.METRICS_SERVER_TIMING:
+            response['Server-Timing'] = ', '.join([
+                'db;dur={:.3f};desc="{} queries"'.format(
+                    timings['db'], request_metrics.queries
+                ),
+                'serialize;dur={:.3f}'.format(timings['serialize']),
+                'render;dur={:.3f}'.format(timings['render']),
+                'total;dur={:.3f}'.format(total),
+            ])
+
+        if settings.METRICS_HISTOGRAMS:
+            metrics.registry.record(
+                view, response.status_code, request_metrics, total
+            )
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({
+                'view': view,
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'queries': request_metrics.queries,
+                'db_ms': round(timings['db'], 3),
+                'serialize_ms': round(timings['serialize'], 3),
+                'render_ms': round(timings['render'], 3),
+                'total_ms': round(total, 3),
+            }))
+
+
+def is_api_request(request):
+    return request.path_info.startswith(settings.API_PATH_PREFIX)
+
+
+class NonApiMiddleware:
+    """
+    Run the middleware listed in NON_API_MIDDLEWARE, in order, for every
+    request outside API_PATH_PREFIX. The API authenticates with tokens, so
+    sessions, CSRF, messages and clickjacking protection are only loaded
+    for the admin and other browser facing pages.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.view_middleware = []
+        self.template_response_middleware = []
+        self.exception_middleware = []
+
+        handler = convert_exception_to_response(get_response)
+        for path in reversed(settings.NON_API_MIDDLEWARE):
+            middleware = import_string(path)(handler)
+            if hasattr(middleware, 'process_view'):
+                self.view_middleware.insert(0, middleware.process_view)
+            if hasattr(middleware, 'process_template_response'):
+                self.template_response_middleware.append(
+                    middleware.process_template_response
+                )
+            if hasattr(middleware, 'process_exception'):
+                self.exception_middleware.append(
+                    middleware.process_exception
+                )
+            handler = convert_exception_to_response(middleware)
+        self.handler = handler
+
+    def __call__(self, request):
+        if is_api_request(request):
+            return self.get_response(request)
+        return self.handler(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if is_api_request(request):
+            return None
+        for process_view in self.view_middleware:
+            response = process_view(request, view_func, view_args, view_kwargs)
+            if response is not None:
+                return response
+        return None
+
+    def process_template_response(self, request, response):
+        if is_api_request(request):
+            return response
+        for process_template_response in self.template_response_middleware:
+            response = process_template_response(request, response)
+        return response
+
+    def process_exception(self, request, exception):
+        if is_api_request(request):
+            return None
+        for process_exception in self.exception_middleware:
+            response = process_exception(request, exception)
+            if response is not None:
+                return response
+        return None
@@ -0,0 +1,36 @@
+from django.db import migrations
+
+
+TABLES = ('core_tag', 'core_ingredient')
+
+
+def create_indexes(apps, schema_editor):
+    # Matches the UPPER("name"::text) LIKE UPPER(...) that istartswith
+    # compiles to on PostgreSQL, other databases don't need it
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table in TABLES:
+        schema_editor.execute(
+            'CREATE INDEX {0}_user_id_upper_name_like ON {0} '
+            '(user_id, UPPER(name::text) text_pattern_ops)'.format(table)
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table in TABLES:
+        schema_editor.execute(
+            'DROP INDEX IF EXISTS {}_user_id_upper_name_like'.format(table)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_collectionversion'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
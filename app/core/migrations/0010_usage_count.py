@@ -0,0 +1,46 @@
+# Generated by Django 2.1.15 on 2026-10-18 20:12
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_usage(apps, schema_editor):
+    """Set usage_count of existing tags and ingredients"""
+    for name in ('tag', 'ingredient'):
+        model = apps.get_model('core', name)
+        links = model._meta.get_field('recipe').through.objects.filter(
+            **{name: OuterRef('pk')}
+        ).order_by().values(name).annotate(count=Count('pk')).values('count')
+        model.objects.update(usage_count=Coalesce(
+            Subquery(links, output_field=models.IntegerField()), 0
+        ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_recipe_link_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ingredient',
+            name='usage_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='tag',
+            name='usage_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='ingredient',
+            index=models.Index(fields=['user', 'usage_count', 'id'], name='core_ingred_user_id_83214e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tag',
+            index=models.Index(fields=['user', 'usage_count', 'id'], name='core_tag_user_id_1fd894_idx'),
+        ),
+        migrations.RunPython(count_usage, migrations.RunPython.noop),
+    ]
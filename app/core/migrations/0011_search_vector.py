@@ -0,0 +1,74 @@
+# Generated by Django 2.1.15 on 2026-10-18 20:14
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+# Table and the column its search document is built from
+SEARCHED = (
+    ('core_recipe', 'title'),
+    ('core_tag', 'name'),
+    ('core_ingredient', 'name'),
+)
+
+
+def create_triggers(apps, schema_editor):
+    # Keep search_vector in sync on every insert and update of the source
+    # column, including bulk_create and update(), and index it. Other
+    # databases search with the fallback in recipe.search.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table, column in SEARCHED:
+        schema_editor.execute(
+            'CREATE TRIGGER {0}_search_vector_update '
+            'BEFORE INSERT OR UPDATE OF {1} ON {0} FOR EACH ROW '
+            'EXECUTE PROCEDURE tsvector_update_trigger('
+            "search_vector, 'pg_catalog.english', {1})".format(table, column)
+        )
+        schema_editor.execute(
+            'UPDATE {0} SET {1} = {1}'.format(table, column)
+        )
+        schema_editor.execute(
+            'CREATE INDEX {0}_search_vector ON {0} '
+            'USING gin (search_vector)'.format(table)
+        )
+
+
+def drop_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table, column in SEARCHED:
+        schema_editor.execute(
+            'DROP TRIGGER IF EXISTS {0}_search_vector_update ON {0}'.format(
+                table
+            )
+        )
+        schema_editor.execute(
+            'DROP INDEX IF EXISTS {}_search_vector'.format(table)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_usage_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ingredient',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='tag',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_triggers, drop_triggers),
+    ]
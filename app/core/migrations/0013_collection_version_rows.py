@@ -0,0 +1,32 @@
+# Generated by Django 2.1.15 on 2026-10-18 21:05
+
+from django.db import migrations
+
+
+def create_versions(apps, schema_editor):
+    # Versions are no longer created when a list is first read, only when
+    # objects are added; create them for collections that already exist
+    CollectionVersion = apps.get_model('core', 'CollectionVersion')
+    for name in ('tag', 'ingredient'):
+        model = apps.get_model('core', name)
+        existing = CollectionVersion.objects.filter(
+            collection=name
+        ).values_list('user_id', flat=True)
+        user_ids = model.objects.exclude(user_id__in=existing).values_list(
+            'user_id', flat=True
+        ).distinct()
+        CollectionVersion.objects.bulk_create([
+            CollectionVersion(user_id=user_id, collection=name, version=1)
+            for user_id in user_ids.iterator()
+        ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_recipe_image'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_versions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations
+
+
+TABLES = ('core_tag', 'core_ingredient')
+
+
+def create_indexes(apps, schema_editor):
+    # The text_pattern_ops indexes of 0007 only serve LIKE prefixes; unless
+    # the database uses the C collation they can't return rows in
+    # ORDER BY UPPER(name) order, which these can
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table in TABLES:
+        schema_editor.execute(
+            'CREATE INDEX {0}_user_id_upper_name ON {0} '
+            '(user_id, UPPER(name::text))'.format(table)
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table in TABLES:
+        schema_editor.execute(
+            'DROP INDEX IF EXISTS {}_user_id_upper_name'.format(table)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_collection_version_rows'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -1,11 +1,21 @@
+import os
+import uuid
+
 from django.db import models
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
+from django.utils import timezone
+from django.contrib.auth.hashers import check_password
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
     PermissionsMixin
 )
 
+from core.hashers import schedule_rehash
+
 
 class UserManager(BaseUserManager):
     """ Create and save new user """
@@ -53,6 +63,12 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     USERNAME_FIELD = 'email'
 
+    def check_password(self, raw_password):
+        """Check the password, upgrading an outdated hash in background"""
+        def setter(raw_password):
+            schedule_rehash(self, raw_password)
+        return check_password(raw_password, self.password, setter)
+
 
 class Tag(models.Model):
     """Tag to be used for receipe"""
@@ -63,6 +79,17 @@ class Tag(models.Model):
         on_delete=models.CASCADE,
     )
 
+    # Number of recipes using it, kept up to date by core.signals
+    usage_count = models.PositiveIntegerField(default=0)
+    # Full-text search document of the name, set by a PostgreSQL trigger
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'name', 'id']),
+            models.Index(fields=['user', 'usage_count', 'id']),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -74,5 +101,123 @@ class Ingredient(models.Model):
         on_delete=models.CASCADE,
     )
 
+    # Number of recipes using it, kept up to date by core.signals
+    usage_count = models.PositiveIntegerField(default=0)
+    # Full-text search document of the name, set by a PostgreSQL trigger
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'name', 'id']),
+            models.Index(fields=['user', 'usage_count', 'id']),
+        ]
+
     def __str__(self):
         return self.name
+
+
+# Models of a user's catalogue by their CollectionVersion.collection name
+CATALOG_MODELS = {
+    'tag': Tag,
+    'ingredient': Ingredient,
+}
+
+
+def recipe_image_file_path(instance, filename):
+    """
+    Generate a unique file path for a new recipe image, so the URLs of an
+    image and its variants never point to different content
+    """
+    ext = os.path.splitext(filename)[1].lower()
+    return os.path.join('uploads', 'recipe', '{}{}'.format(uuid.uuid4(), ext))
+
+
+class Recipe(models.Model):
+    """Recipe object"""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+    )
+    title = models.CharField(max_length=255)
+    time_minutes = models.IntegerField()
+    price = models.DecimalField(max_digits=5, decimal_places=2)
+    link = models.CharField(max_length=255, blank=True)
+    ingredients = models.ManyToManyField('Ingredient')
+    tags = models.ManyToManyField('Tag')
+    image = models.ImageField(null=True, upload_to=recipe_image_file_path)
+    # Set once the pre-sized variants of the image exist (see recipe.images)
+    image_variants_ready = models.BooleanField(default=False)
+    # Full-text search document of the title, set by a PostgreSQL trigger
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'id']),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+def count_recipes(model):
+    """
+    Return an expression counting the recipes linked to each Tag or
+    Ingredient, the value usage_count is kept at
+    """
+    name = model._meta.model_name
+    links = model._meta.get_field('recipe').through.objects.filter(
+        **{name: OuterRef('pk')}
+    ).order_by().values(name).annotate(count=Count('pk')).values('count')
+    return Coalesce(Subquery(links, output_field=models.IntegerField()), 0)
+
+
+class CollectionVersionManager(models.Manager):
+
+    def bump(self, user_id, collection, create=False):
+        """
+        Mark a user's collection as changed. The row is only created when
+        `create` is set, which writes adding objects do; other changes
+        need an object that was added before. Deletes cascading from the
+        user therefore never recreate the row.
+        """
+        changed = self.filter(user_id=user_id, collection=collection).update(
+            version=F('version') + 1,
+            updated_at=timezone.now(),
+        )
+        if changed or not create:
+            return
+        _, created = self.get_or_create(
+            user_id=user_id, collection=collection, defaults={'version': 1}
+        )
+        if not created:
+            self.bump(user_id, collection)
+
+    def get_version(self, user_id, collection):
+        """
+        Return the version and last change time of a collection, or 0 and
+        None if it was never changed
+        """
+        version = self.filter(
+            user_id=user_id, collection=collection
+        ).values_list('version', 'updated_at').first()
+        return version or (0, None)
+
+
+class CollectionVersion(models.Model):
+    """Change counter of a user's tags or ingredients"""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+    )
+    collection = models.CharField(max_length=50)
+    version = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    objects = CollectionVersionManager()
+
+    class Meta:
+        unique_together = ('user', 'collection')
+
+    def __str__(self):
+        return '{} v{}'.format(self.collection, self.version)
@@ -0,0 +1,152 @@
+import time
+
+from django.conf import settings
+from django.core.signals import request_started, request_finished
+from django.db import connections
+from django.db.models import F
+from django.db.models.signals import (
+    post_save, post_delete, pre_delete, m2m_changed,
+)
+from django.dispatch import receiver
+
+from rest_framework.authtoken.models import Token
+
+from core.authentication import invalidate_token
+from core.models import Tag, Ingredient, Recipe, CollectionVersion
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    """Stop serving a token from the cache once it is deleted"""
+    invalidate_token(instance.key, instance.user_id)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_tokens(sender, instance, created, **kwargs):
+    """Drop cached tokens of a user that was updated or deactivated"""
+    if created:
+        return
+    # Users loaded by CachedTokenAuthentication already carry their token
+    relation = Token._meta.get_field('user').remote_field
+    if relation.is_cached(instance):
+        token = relation.get_cached_value(instance)
+        keys = [token.key] if token is not None else []
+    else:
+        keys = Token.objects.filter(user=instance).values_list(
+            'key', flat=True
+        )
+    for key in keys:
+        invalidate_token(key, instance.pk)
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(post_save, sender=Ingredient)
+@receiver(post_delete, sender=Ingredient)
+def bump_collection_version(sender, instance, created=False, **kwargs):
+    """Mark the owner's tags or ingredients as changed"""
+    CollectionVersion.objects.bump(
+        instance.user_id, sender._meta.model_name, create=created
+    )
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+@receiver(m2m_changed, sender=Recipe.ingredients.through)
+def bump_linked_collection_version(sender, instance, action, reverse,
+                                   model, **kwargs):
+    """
+    Mark the owner's tags or ingredients as changed when they are linked
+    to or unlinked from recipes, which changes their assigned_only lists
+    """
+    if not action.startswith('post_'):
+        return
+    collection = type(instance) if reverse else model
+    CollectionVersion.objects.bump(
+        instance.user_id, collection._meta.model_name
+    )
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+@receiver(m2m_changed, sender=Recipe.ingredients.through)
+def update_usage_count(sender, instance, action, reverse, model, pk_set,
+                       **kwargs):
+    """
+    Keep usage_count of tags and ingredients in step with their links to
+    recipes. Links are removed before they are gone so only existing ones
+    are counted; drift is corrected by the recount_usage command.
+    """
+    if not reverse:
+        # instance is a recipe, pk_set holds tag or ingredient ids
+        if action == 'post_add':
+            model.objects.filter(pk__in=pk_set).update(
+                usage_count=F('usage_count') + 1
+            )
+        elif action == 'pre_remove':
+            model.objects.filter(pk__in=pk_set, recipe=instance).update(
+                usage_count=F('usage_count') - 1
+            )
+        elif action == 'pre_clear':
+            model.objects.filter(recipe=instance).update(
+                usage_count=F('usage_count') - 1
+            )
+        return
+
+    # instance is a tag or ingredient, pk_set holds recipe ids
+    counted = type(instance).objects.filter(pk=instance.pk)
+    if action == 'post_add':
+        counted.update(usage_count=F('usage_count') + len(pk_set))
+    elif action == 'pre_remove':
+        removed = sender.objects.filter(**{
+            instance._meta.model_name: instance, 'recipe__in': pk_set,
+        }).count()
+        counted.update(usage_count=F('usage_count') - removed)
+    elif action == 'pre_clear':
+        counted.update(usage_count=0)
+
+
+@receiver(pre_delete, sender=Recipe)
+def update_deleted_recipe_usage_count(sender, instance, **kwargs):
+    """Deleting a recipe removes its links without m2m_changed"""
+    for model in (Tag, Ingredient):
+        model.objects.filter(recipe=instance).update(
+            usage_count=F('usage_count') - 1
+        )
+
+
+@receiver(post_delete, sender=Recipe)
+def bump_recipe_collection_versions(sender, instance, **kwargs):
+    """Deleting a recipe unlinks its tags and ingredients without signals"""
+    for model in (Tag, Ingredient):
+        CollectionVersion.objects.bump(
+            instance.user_id, model._meta.model_name
+        )
+
+
+@receiver(request_finished)
+def mark_connections_idle(**kwargs):
+    """Remember when the connections were last used by a request"""
+    now = time.monotonic()
+    for connection in connections.all():
+        connection.request_finished_at = now
+
+
+@receiver(request_started)
+def check_connection_health(**kwargs):
+    """
+    Close persistent connections the server dropped while they were idle,
+    so the request opens a new one instead of failing on its first query.
+    is_usable() costs a round trip, so only connections idle for at least
+    DB_CONN_HEALTH_CHECK_IDLE seconds are checked.
+    """
+    if not settings.DB_CONN_HEALTH_CHECKS:
+        return
+    now = time.monotonic()
+    for connection in connections.all():
+        if connection.connection is None:
+            continue
+        finished_at = getattr(connection, 'request_finished_at', None)
+        if finished_at is not None and \
+                now - finished_at < settings.DB_CONN_HEALTH_CHECK_IDLE:
+            continue
+        if not connection.is_usable():
+            connection.close()
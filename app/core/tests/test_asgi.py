@@ -0,0 +1,172 @@
+import asyncio
+import json
+import threading
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.wsgi import get_wsgi_application
+from django.db import connections
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+
+from core.asgi import WsgiToAsgiHandler
+
+
+def run(coroutine):
+    return asyncio.new_event_loop().run_until_complete(coroutine)
+
+
+class AsgiHandlerTests(TransactionTestCase):
+    """
+    Requests run in the handler's worker thread, on its own database
+    connection outside any test transaction, so tables are flushed after
+    every test instead
+    """
+
+    def setUp(self):
+        self.handler = WsgiToAsgiHandler(
+            get_wsgi_application(), max_workers=1
+        )
+
+    def tearDown(self):
+        # Close the worker's connections so they don't hold up the flush
+        # or the test database teardown
+        self.handler.executor.submit(connections.close_all).result()
+        self.handler.executor.shutdown()
+
+    def call(self, method, path, chunks=(b'',), headers=()):
+        """Send a request through the handler, return status and body"""
+        scope = {
+            'type': 'http',
+            'http_version': '1.1',
+            'method': method,
+            'path': path,
+            'query_string': b'',
+            'headers': [(b'host', b'testserver')] + list(headers),
+            'client': ('127.0.0.1', 12345),
+            'server': ('testserver', 80),
+        }
+        messages = [
+            {
+                'type': 'http.request',
+                'body': chunk,
+                'more_body': i < len(chunks) - 1,
+            }
+            for i, chunk in enumerate(chunks)
+        ]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        run(self.handler(scope, receive, send))
+        body = b''.join(m.get('body', b'') for m in sent[1:])
+        return sent[0]['status'], dict(sent[0]['headers']), body
+
+    def test_get_request(self):
+        """Test requests are handled by the Django application"""
+        status, headers, body = self.call('GET', reverse('user:me'))
+
+        self.assertEqual(status, 401)
+        self.assertEqual(headers[b'content-type'], b'application/json')
+        self.assertIn(b'credentials', body)
+
+    def test_request_body_in_chunks(self):
+        """Test a request body received in several messages is joined"""
+        payload = json.dumps({
+            'email': 'asgi@example.com',
+            'password': 'password123',
+            'name': 'Test',
+        }).encode()
+
+        status, headers, body = self.call(
+            'POST', reverse('user:create'),
+            chunks=(payload[:10], payload[10:]),
+            headers=[
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(payload)).encode()),
+            ],
+        )
+
+        self.assertEqual(status, 201)
+        self.assertTrue(get_user_model().objects.filter(
+            email='asgi@example.com'
+        ).exists())
+
+    def test_lifespan(self):
+        """Test startup and shutdown events are acknowledged"""
+        messages = [
+            {'type': 'lifespan.startup'},
+            {'type': 'lifespan.shutdown'},
+        ]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message['type'])
+
+        # Shutting down stops the executor, use a handler of its own
+        handler = WsgiToAsgiHandler(get_wsgi_application(), max_workers=1)
+        run(handler({'type': 'lifespan'}, receive, send))
+
+        self.assertEqual(sent, [
+            'lifespan.startup.complete', 'lifespan.shutdown.complete',
+        ])
+
+
+class LoadTestCommandTests(TestCase):
+
+    def run_loadtest(self, response, **options):
+        """Run the load test against a server sending `response`"""
+        loop = asyncio.new_event_loop()
+
+        async def respond(reader, writer):
+            while await reader.readline() not in (b'\r\n', b''):
+                pass
+            writer.write(response)
+            await writer.drain()
+            writer.close()
+
+        server = loop.run_until_complete(
+            asyncio.start_server(respond, '127.0.0.1', 0)
+        )
+        port = server.sockets[0].getsockname()[1]
+        thread = threading.Thread(target=loop.run_forever)
+        thread.start()
+        try:
+            out = StringIO()
+            call_command(
+                'loadtest', 'http://127.0.0.1:{}/'.format(port),
+                stdout=out, **options
+            )
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            server.close()
+        return out.getvalue().splitlines()
+
+    def test_loadtest(self):
+        """Test the load test reports every concurrency level"""
+        lines = self.run_loadtest(
+            b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}',
+            concurrency=[1, 5], requests=1,
+        )
+
+        self.assertEqual(len(lines), 2)
+        self.assertIn('0 errors', lines[1])
+
+    def test_loadtest_truncated_response(self):
+        """Test a connection closed mid-body counts as an error"""
+        lines = self.run_loadtest(
+            b'HTTP/1.1 200 OK\r\nContent-Length: 10\r\n\r\n{}',
+            concurrency=[2], requests=1,
+        )
+
+        self.assertEqual(len(lines), 1)
+        self.assertIn('2 errors', lines[0])
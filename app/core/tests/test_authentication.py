@@ -0,0 +1,152 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.authentication import (
+    CACHE_KEY_PREFIX,
+    CachedTokenAuthentication,
+    TokenCache,
+    token_cache,
+)
+
+
+ME_URL = reverse('user:me')
+
+
+def locmem_cache():
+    """Return an empty local memory cache to stand in for a shared one"""
+    return LocMemCache('token-tests', {})
+
+
+class TokenCacheTests(TestCase):
+    """Test the in-process token cache"""
+
+    def test_evicts_least_recently_used(self):
+        cache = TokenCache(max_size=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+
+    @patch('core.authentication.time.monotonic')
+    def test_expired_entries_are_dropped(self, monotonic):
+        cache = TokenCache(max_size=2, ttl=60)
+        monotonic.return_value = 100
+        cache.set('a', 1)
+        monotonic.return_value = 161
+
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(len(cache), 0)
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Test authenticating with cached tokens"""
+
+    def setUp(self):
+        token_cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email='test@example.com',
+            password='test123',
+            name='name'
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+    def tearDown(self):
+        token_cache.clear()
+
+    def test_token_lookup_is_cached(self):
+        """Test only the first request queries the token"""
+        with self.assertNumQueries(1):
+            self.client.get(ME_URL)
+        with self.assertNumQueries(0):
+            response = self.client.get(ME_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['email'], self.user.email)
+
+    def test_deleted_token_is_rejected(self):
+        self.client.get(ME_URL)
+        self.token.delete()
+
+        response = self.client.get(ME_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get(ME_URL)
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get(ME_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @patch('core.authentication.time.monotonic')
+    def test_deleted_token_rejected_by_other_processes(self, monotonic):
+        """Test local entries signals can't clear expire quickly"""
+        monotonic.return_value = 100
+        self.client.get(ME_URL)
+        entry = token_cache.get(self.token.key)
+        self.token.delete()
+        # Entry of another process, which the signal didn't reach
+        token_cache.set(self.token.key, entry)
+        monotonic.return_value = 100 + token_cache.ttl + 1
+
+        response = self.client.get(ME_URL)
+
+        self.assertLess(token_cache.ttl, 10)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_updated_user_is_reloaded(self):
+        """Test updates through the me endpoint refresh the cached user"""
+        self.client.get(ME_URL)
+        self.client.patch(ME_URL, {'name': 'new name'})
+
+        response = self.client.get(ME_URL)
+
+        self.assertEqual(response.data['name'], 'new name')
+
+    def test_password_hash_not_cached(self):
+        """Test cache entries leave out the password hash"""
+        self.client.get(ME_URL)
+
+        entry = token_cache.get(self.token.key)
+
+        self.assertNotIn(self.user.password, repr(entry))
+
+    def test_password_loaded_on_access(self):
+        """Test the user built from the cache still has its password"""
+        self.client.get(ME_URL)
+        user, _ = CachedTokenAuthentication().authenticate_credentials(
+            self.token.key
+        )
+
+        self.assertEqual(user, self.user)
+        self.assertTrue(user.check_password('test123'))
+
+    def test_malformed_shared_entry_is_replaced(self):
+        """Test unexpected values in the shared cache are not trusted"""
+        shared = locmem_cache()
+        shared.set(CACHE_KEY_PREFIX + self.token.key, b'not a token entry')
+
+        with self.settings(TOKEN_CACHE_ALIAS='tokens'), \
+                patch('core.authentication.caches', {'tokens': shared}):
+            response = self.client.get(ME_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(
+            shared.get(CACHE_KEY_PREFIX + self.token.key), dict
+        )
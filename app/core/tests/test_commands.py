@@ -1,23 +1,214 @@
+import json
+import os
+import tempfile
+from io import StringIO
 from unittest.mock import patch
 
+from django.contrib.auth import get_user_model
 from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.db.utils import OperationalError
 from django.test import TestCase
 
+from core.models import Tag, Ingredient, CollectionVersion
 
+
+CHECK_DATABASE = (
+    'core.management.commands.wait_for_db.Command.check_database'
+)
+
+
+@patch('time.sleep', return_value=True)
 class CommandTests(TestCase):
 
-    def test_wait_for_db_ready(self):
+    def test_wait_for_db_ready(self, ts):
         """Test waiting for db when db is available"""
-        with patch('django.db.utils.ConnectionHandler.__getitem__') as gi:
-            gi.return_value = True
-            call_command('wait_for_db')
-            self.assertEqual(gi.call_count, 1)
+        with patch(CHECK_DATABASE) as cd:
+            call_command('wait_for_db', stdout=StringIO())
+            cd.assert_called_once_with('default')
+            ts.assert_not_called()
 
-    @patch('time.sleep', return_value=True)
     def test_wait_for_db(self, ts):
         """Test waiting for db"""
+        with patch(CHECK_DATABASE) as cd:
+            cd.side_effect = [OperationalError] * 5 + [None]
+            call_command('wait_for_db', stdout=StringIO())
+            self.assertEqual(cd.call_count, 6)
+            self.assertEqual(ts.call_count, 5)
+
+    @patch('random.uniform', return_value=0)
+    def test_wait_for_db_backoff(self, ru, ts):
+        """Test the delay doubles up to the maximum"""
+        with patch(CHECK_DATABASE) as cd:
+            cd.side_effect = [OperationalError] * 4 + [None]
+            call_command(
+                'wait_for_db', initial_delay=1, max_delay=4, stdout=StringIO()
+            )
+            delays = [call[0][0] for call in ts.call_args_list]
+            self.assertEqual(delays, [0.5, 1, 2, 2])
+
+    @patch('time.monotonic')
+    def test_wait_for_db_timeout(self, tm, ts):
+        """Test the command fails once the timeout has passed"""
+        tm.side_effect = [0, 5, 11]
+        with patch(CHECK_DATABASE) as cd:
+            cd.side_effect = OperationalError
+            with self.assertRaises(CommandError):
+                call_command('wait_for_db', timeout=10, stdout=StringIO())
+            self.assertEqual(cd.call_count, 2)
+
+    def test_wait_for_multiple_databases(self, ts):
+        with patch(CHECK_DATABASE) as cd:
+            call_command(
+                'wait_for_db', databases=['default', 'replica'],
+                stdout=StringIO()
+            )
+            self.assertEqual(
+                [call[0][0] for call in cd.call_args_list],
+                ['default', 'replica']
+            )
+
+    def test_check_database_runs_query(self, ts):
+        """Test the database is probed with a real query"""
         with patch('django.db.utils.ConnectionHandler.__getitem__') as gi:
-            gi.side_effect = [OperationalError] * 5 + [True]
-            call_command('wait_for_db')
-            self.assertEqual(gi.call_count, 6)
+            call_command('wait_for_db', stdout=StringIO())
+            cursor = gi.return_value.cursor.return_value.__enter__
+            cursor.return_value.execute.assert_called_once_with('SELECT 1')
+            gi.return_value.close.assert_called_once_with()
+
+
+class CatalogCommandTests(TestCase):
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='test@example.com',
+            password='test123'
+        )
+
+    def test_export_catalog(self):
+        """Test tags and ingredients are exported one per line"""
+        Tag.objects.create(user=self.user, name='vegan')
+        Ingredient.objects.create(user=self.user, name='salt')
+        out = StringIO()
+
+        call_command('export_catalog', stdout=out, stderr=StringIO())
+
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(rows, [
+            {'type': 'tag', 'user': self.user.email, 'name': 'vegan'},
+            {'type': 'ingredient', 'user': self.user.email, 'name': 'salt'},
+        ])
+
+    def test_import_catalog(self):
+        """Test rows are created in batches and unknown users skipped"""
+        lines = [
+            {'type': 'tag', 'user': self.user.email, 'name': 'vegan'},
+            {'type': 'tag', 'user': self.user.email, 'name': 'dessert'},
+            {'type': 'tag', 'user': self.user.email, 'name': 'quick'},
+            {'type': 'ingredient', 'user': self.user.email, 'name': 'salt'},
+            {'type': 'tag', 'user': 'unknown@example.com', 'name': 'x'},
+        ]
+        source = StringIO('\n'.join(json.dumps(line) for line in lines))
+
+        with patch('sys.stdin', source):
+            call_command(
+                'import_catalog', batch_size=2,
+                stdout=StringIO(), stderr=StringIO()
+            )
+
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 3)
+        self.assertEqual(Ingredient.objects.filter(user=self.user).count(), 1)
+        self.assertFalse(Tag.objects.filter(name='x').exists())
+
+    def test_import_catalog_invalid_row(self):
+        with patch('sys.stdin', StringIO('not json\n')):
+            with self.assertRaises(CommandError):
+                call_command('import_catalog', stdout=StringIO())
+
+    def test_import_catalog_invalid_name(self):
+        for name in (None, '', 'x' * 256):
+            line = json.dumps(
+                {'type': 'tag', 'user': self.user.email, 'name': name}
+            )
+            with patch('sys.stdin', StringIO(line)):
+                with self.assertRaisesMessage(CommandError, 'line 1'):
+                    call_command('import_catalog', stdout=StringIO())
+
+    def test_import_catalog_invalid_row_rolls_back(self):
+        """Test batches before an invalid row are not kept"""
+        lines = [
+            json.dumps({'type': 'tag', 'user': self.user.email, 'name': name})
+            for name in ('vegan', 'dessert', 'quick')
+        ] + ['not json']
+        source = StringIO('\n'.join(lines))
+
+        with patch('sys.stdin', source):
+            with self.assertRaisesMessage(CommandError, 'line 4'):
+                call_command(
+                    'import_catalog', batch_size=2, stdout=StringIO()
+                )
+
+        self.assertFalse(Tag.objects.exists())
+        self.assertFalse(CollectionVersion.objects.filter(
+            user=self.user, collection='tag'
+        ).exists())
+
+
+class ProfileStartupCommandTests(TestCase):
+
+    def test_profile_startup(self):
+        """Test the first request is served and imports are listed"""
+        out = StringIO()
+        call_command('profile_startup', runs=1, top=3, stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertIn('first request', lines[0])
+        self.assertIn('(status 401)', lines[0])
+        self.assertEqual(len(lines), 4)
+
+    def test_profile_startup_target(self):
+        """Test exceeding the target time to first request fails"""
+        with self.assertRaises(CommandError):
+            call_command(
+                'profile_startup', runs=1, target=0.001, stdout=StringIO()
+            )
+
+
+class BenchmarkApiCommandTests(TestCase):
+
+    def test_benchmark_api(self):
+        """Test a tiny run through the full command, system checks included"""
+        out = StringIO()
+
+        call_command(
+            'benchmark_api', sizes=[3], requests=1, warmup=0,
+            skip_checks=False, stdout=out,
+        )
+
+        output = out.getvalue()
+        for endpoint in ('tag-list', 'tag-create', 'me', 'token', 'search'):
+            self.assertIn(endpoint, output)
+        self.assertFalse(get_user_model().objects.filter(
+            email__startswith='benchmark-'
+        ).exists())
+
+    def test_benchmark_api_compare(self):
+        with tempfile.TemporaryDirectory() as directory:
+            baseline = os.path.join(directory, 'baseline.json')
+            call_command(
+                'benchmark_api', sizes=[3], requests=1, warmup=0,
+                output=baseline, stdout=StringIO(),
+            )
+            with open(baseline) as baseline_file:
+                report = json.load(baseline_file)
+            for result in report['results']:
+                result['queries'] = 0
+            with open(baseline, 'w') as baseline_file:
+                json.dump(report, baseline_file)
+
+            with self.assertRaises(CommandError):
+                call_command(
+                    'benchmark_api', sizes=[3], requests=1, warmup=0,
+                    compare=baseline, fail_on_regression=True,
+                    stdout=StringIO(),
+                )
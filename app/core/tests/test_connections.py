@@ -0,0 +1,62 @@
+from unittest.mock import patch, MagicMock
+
+from django.core.signals import request_started, request_finished
+from django.test import TestCase, override_settings
+
+
+@patch('core.signals.time.monotonic')
+@patch('core.signals.connections')
+@override_settings(DB_CONN_HEALTH_CHECK_IDLE=10)
+class ConnectionHealthTests(TestCase):
+    """Test idle connections are checked at the start of requests"""
+
+    def setUp(self):
+        self.connection = MagicMock(request_finished_at=None)
+
+    def test_broken_connection_closed(self, connections, monotonic):
+        self.connection.is_usable.return_value = False
+        connections.all.return_value = [self.connection]
+
+        request_started.send(sender=self.__class__)
+
+        self.connection.close.assert_called_once_with()
+
+    def test_usable_connection_kept(self, connections, monotonic):
+        self.connection.is_usable.return_value = True
+        connections.all.return_value = [self.connection]
+
+        request_started.send(sender=self.__class__)
+
+        self.connection.close.assert_not_called()
+
+    def test_recently_used_connection_not_checked(self, connections,
+                                                  monotonic):
+        """Test a connection in steady use costs no extra round trip"""
+        connections.all.return_value = [self.connection]
+        monotonic.return_value = 100
+        request_finished.send(sender=self.__class__)
+        monotonic.return_value = 109
+
+        request_started.send(sender=self.__class__)
+
+        self.assertEqual(self.connection.request_finished_at, 100)
+        self.connection.is_usable.assert_not_called()
+
+    def test_idle_connection_checked(self, connections, monotonic):
+        self.connection.is_usable.return_value = False
+        connections.all.return_value = [self.connection]
+        monotonic.return_value = 100
+        request_finished.send(sender=self.__class__)
+        monotonic.return_value = 110
+
+        request_started.send(sender=self.__class__)
+
+        self.connection.close.assert_called_once_with()
+
+    @override_settings(DB_CONN_HEALTH_CHECKS=False)
+    def test_health_checks_disabled(self, connections, monotonic):
+        connections.all.return_value = [self.connection]
+
+        request_started.send(sender=self.__class__)
+
+        self.connection.is_usable.assert_not_called()
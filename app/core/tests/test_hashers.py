@@ -0,0 +1,66 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from core.hashers import rehash_password
+
+
+TOKEN_URL = reverse('user:token')
+
+
+@override_settings(
+    PASSWORD_HASHER_ITERATIONS=1000,
+    PASSWORD_REHASH_ASYNC=False,
+)
+class PasswordHasherTests(TestCase):
+    """Test the configurable hasher policy"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='test@example.com',
+            password='test123'
+        )
+
+    def test_new_hashes_use_configured_iterations(self):
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$1000$'))
+
+    def test_outdated_hash_upgraded_on_login(self):
+        """Test logging in rehashes a password with other iterations"""
+        with override_settings(PASSWORD_HASHER_ITERATIONS=2000):
+            self.user.password = make_password('test123')
+            self.user.save()
+
+        response = APIClient().post(
+            TOKEN_URL, {'email': self.user.email, 'password': 'test123'}
+        )
+
+        self.assertIn('token', response.data)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$1000$'))
+        self.assertTrue(self.user.check_password('test123'))
+
+    def test_changed_password_not_overwritten(self):
+        """Test a stale rehash doesn't replace a newer password"""
+        old_password = self.user.password
+        self.user.set_password('newpass123')
+        self.user.save()
+
+        rehash_password(self.user.pk, old_password, 'test123')
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('newpass123'))
+
+    @override_settings(PASSWORD_REHASH_ASYNC=True)
+    @patch('core.hashers.rehash_executor')
+    def test_rehash_runs_in_background(self, executor):
+        with override_settings(PASSWORD_HASHER_ITERATIONS=2000):
+            self.user.password = make_password('test123')
+
+        self.assertTrue(self.user.check_password('test123'))
+
+        executor.submit.assert_called_once()
@@ -0,0 +1,89 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import metrics
+
+from recipe.cache import list_cache
+
+
+TAGS_URL = reverse('recipe:tag-list')
+METRICS_URL = reverse('metrics')
+
+
+@override_settings(METRICS_SERVER_TIMING=True, METRICS_HISTOGRAMS=True)
+class RequestMetricsTests(TestCase):
+    """Test the request metrics middleware and endpoint"""
+
+    def setUp(self):
+        metrics.registry.reset()
+        self.user = get_user_model().objects.create_user(
+            email='test@example.com',
+            password='test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_server_timing_header(self):
+        response = self.client.get(TAGS_URL)
+
+        timing = response['Server-Timing']
+        for name in ['db', 'serialize', 'render', 'total']:
+            self.assertIn(name + ';dur=', timing)
+        self.assertIn('queries', timing)
+
+    @override_settings(METRICS_SERVER_TIMING=False)
+    def test_server_timing_disabled(self):
+        response = self.client.get(TAGS_URL)
+
+        self.assertFalse(response.has_header('Server-Timing'))
+
+    def test_structured_log(self):
+        with self.assertLogs('core.metrics', level='INFO') as logs:
+            self.client.get(TAGS_URL)
+
+        self.assertIn('"view": "recipe:tag-list"', logs.output[0])
+
+    def test_metrics_endpoint_admin_only(self):
+        response = self.client.get(METRICS_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_metrics_endpoint_histograms(self):
+        self.client.get(TAGS_URL)
+        self.client.get(TAGS_URL)
+        admin = get_user_model().objects.create_superuser(
+            email='admin@example.com',
+            password='test123'
+        )
+        self.client.force_authenticate(admin)
+
+        response = self.client.get(METRICS_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        stats = response.data['recipe:tag-list']
+        self.assertEqual(stats['requests'], 2)
+        self.assertEqual(stats['total']['count'], 2)
+        self.assertGreater(stats['queries'], 0)
+
+    @override_settings(RECIPE_LIST_CACHE_ALIAS='default')
+    def test_metrics_endpoint_list_cache(self):
+        cache.clear()
+        list_cache.reset_stats()
+        self.client.get(TAGS_URL)
+        self.client.get(TAGS_URL)
+        admin = get_user_model().objects.create_superuser(
+            email='admin@example.com',
+            password='test123'
+        )
+        self.client.force_authenticate(admin)
+
+        response = self.client.get(METRICS_URL)
+
+        self.assertEqual(
+            response.data['list_cache'], {'hits': 1, 'misses': 1}
+        )
@@ -0,0 +1,74 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from rest_framework.authtoken.models import Token
+
+
+ME_URL = reverse('user:me')
+ADMIN_LOGIN_URL = reverse('admin:login')
+
+
+class NonApiMiddlewareTests(TestCase):
+    """Test session and CSRF middleware only run outside the API"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_superuser(
+            email='admin@example.com',
+            password='test123'
+        )
+        self.token = Token.objects.create(user=self.user)
+
+    def test_api_request_skips_browser_middleware(self):
+        client = Client(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        response = client.get(ME_URL)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(hasattr(response.wsgi_request, 'session'))
+        self.assertFalse(response.has_header('X-Frame-Options'))
+
+    def test_api_ignores_session_login(self):
+        """Test a logged in admin session doesn't authenticate the API"""
+        client = Client()
+        client.force_login(self.user)
+        response = client.get(ME_URL)
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_admin_login(self):
+        client = Client(enforce_csrf_checks=True)
+        response = client.get(ADMIN_LOGIN_URL)
+        self.assertEqual(response['X-Frame-Options'], 'SAMEORIGIN')
+
+        response = client.post(ADMIN_LOGIN_URL, {
+            'username': 'admin@example.com',
+            'password': 'test123',
+            'csrfmiddlewaretoken': response.context['csrf_token'],
+            'next': reverse('admin:index'),
+        })
+
+        self.assertRedirects(response, reverse('admin:index'))
+
+    def test_admin_requires_csrf_token(self):
+        client = Client(enforce_csrf_checks=True)
+        response = client.post(ADMIN_LOGIN_URL, {
+            'username': 'admin@example.com',
+            'password': 'test123',
+        })
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_benchmark_middleware(self):
+        out = StringIO()
+        call_command(
+            'benchmark_middleware', requests=5, warmup=1, stdout=out
+        )
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual(
+            [line.split()[0] for line in lines],
+            ['none', 'full', 'configured'],
+        )
@@ -0,0 +1,23 @@
+class QueryCountMixin:
+    """
+    TestCase mixin asserting a request runs the same number of queries no
+    matter how much data the user owns
+    """
+    sizes = (1, 10, 100)
+
+    def assertConstantQueries(self, expected, request, seed=None, cold=None):
+        """
+        Grow the dataset to each of `sizes` with seed(count) and check
+        request() runs exactly `expected` queries every time. The first
+        request is made before anything is cached or created on first use
+        and must run `cold` queries, `expected` unless given.
+        """
+        with self.assertNumQueries(expected if cold is None else cold):
+            request()
+        seeded = 0
+        for size in self.sizes:
+            if seed is not None:
+                seed(size - seeded)
+                seeded = size
+            with self.assertNumQueries(expected):
+                request()
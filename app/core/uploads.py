@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+from django.http import QueryDict
+from django.utils.datastructures import MultiValueDict
+
+
+class MaxSizeUploadHandler(FileUploadHandler):
+    """
+    Stop reading a multipart request once an uploaded file grows beyond
+    `max_size` bytes, so oversized uploads are never fully received or
+    written to disk. Requests whose Content-Length can't fit a file of
+    that size next to the other form data are refused without reading
+    the body. Must be the first upload handler; `exceeded` tells the view
+    why the files are missing.
+    """
+
+    def __init__(self, request=None, max_size=None):
+        super().__init__(request)
+        self.max_size = max_size
+        self.exceeded = False
+        self.received = 0
+
+    def handle_raw_input(self, input_data, META, content_length, boundary,
+                         encoding=None):
+        form_size = settings.DATA_UPLOAD_MAX_MEMORY_SIZE
+        if form_size is not None and \
+                content_length > self.max_size + form_size:
+            self.exceeded = True
+            return QueryDict(encoding=encoding), MultiValueDict()
+        return None
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > self.max_size:
+            self.exceeded = True
+            raise StopUpload(connection_reset=True)
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None
@@ -1,3 +1,42 @@
-# from django.shortcuts import render
-#
-# # Create your views here.
+from django.conf import settings
+from django.utils.cache import patch_cache_control
+from django.views import static
+
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core import metrics
+from core.authentication import CachedTokenAuthentication
+
+from recipe.cache import list_cache
+
+
+class MetricsView(APIView):
+    """
+    Return the request metrics histograms of this process, by view name,
+    and the hit and miss counts of its list cache under `list_cache`
+    """
+    authentication_classes = (CachedTokenAuthentication,)
+    permission_classes = (permissions.IsAdminUser,)
+
+    def get(self, request):
+        data = metrics.registry.snapshot()
+        data['list_cache'] = list_cache.stats()
+        return Response(data)
+
+
+def serve_media(request, path):
+    """
+    Serve an uploaded file from MEDIA_ROOT. Uploads get unique names and
+    are never changed in place, so the response may be cached for
+    MEDIA_CACHE_SECONDS without revalidation.
+    """
+    response = static.serve(request, path, document_root=settings.MEDIA_ROOT)
+    patch_cache_control(
+        response,
+        public=True,
+        max_age=settings.MEDIA_CACHE_SECONDS,
+        immutable=True,
+    )
+    return response
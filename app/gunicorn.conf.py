@@ -0,0 +1,43 @@
+"""
+Gunicorn configuration for the production profile, see
+docker-compose.prod.yml. Every value can be overridden by an environment
+variable; send SIGHUP to the master process to reload the workers
+gracefully.
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+# Threaded WSGI workers by default, 'uvicorn.workers.UvicornWorker' serves
+# app.asgi instead
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# Every thread keeps its own database connection open (DB_CONN_MAX_AGE), so
+# the default of 2 * cores + 1 workers is capped to hold at most
+# DB_MAX_CONNECTIONS; PostgreSQL accepts 100 connections by default, shared
+# with every other container and client
+if 'uvicorn' in worker_class.lower():
+    connections_per_worker = int(os.environ.get('ASGI_WORKER_THREADS', 16))
+else:
+    connections_per_worker = threads
+db_max_connections = int(os.environ.get('DB_MAX_CONNECTIONS', 40))
+workers = int(os.environ.get('GUNICORN_WORKERS', max(1, min(
+    multiprocessing.cpu_count() * 2 + 1,
+    db_max_connections // connections_per_worker,
+))))
+
+# Seconds a worker may spend on a request before it is restarted, and to
+# finish in-flight requests on reload or shutdown
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# Recycle workers now and then so slow leaks can't accumulate
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+accesslog = '-'
+errorlog = '-'
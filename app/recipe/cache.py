@@ -0,0 +1,59 @@
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+class ListCache:
+    """
+    Rendered list responses keyed by their ETag. The ETag covers the user,
+    the collection version, the format and the full URL, so every write
+    that bumps the version (see core.signals) makes older entries
+    unreachable without having to know their keys.
+    """
+    key_prefix = 'recipe-list:'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self):
+        return bool(settings.RECIPE_LIST_CACHE_ALIAS)
+
+    @property
+    def cache(self):
+        return caches[settings.RECIPE_LIST_CACHE_ALIAS]
+
+    def get_key(self, etag):
+        return self.key_prefix + etag.strip('"')
+
+    def get(self, etag):
+        """Return the cached (content, content type) or None"""
+        cached = self.cache.get(self.get_key(etag))
+        with self._lock:
+            if cached is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return cached
+
+    def set(self, etag, response):
+        self.cache.set(
+            self.get_key(etag),
+            (response.content, response['Content-Type']),
+            settings.RECIPE_LIST_CACHE_TIMEOUT,
+        )
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+
+list_cache = ListCache()
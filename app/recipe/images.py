@@ -0,0 +1,97 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection
+
+from PIL import Image, ImageOps
+
+from core.models import Recipe
+
+
+logger = logging.getLogger(__name__)
+
+# Pillow warns about images above this size and refuses twice as many
+# pixels when opening them, before anything is decoded
+Image.MAX_IMAGE_PIXELS = settings.RECIPE_IMAGE_MAX_PIXELS
+
+image_executor = ThreadPoolExecutor(
+    max_workers=settings.RECIPE_IMAGE_WORKERS,
+    thread_name_prefix='recipe-image',
+)
+
+
+def variant_name(name, variant):
+    """Return the storage name of a pre-sized variant of image `name`"""
+    return '{}-{}.jpg'.format(os.path.splitext(name)[0], variant)
+
+
+def create_variants(recipe_id, name):
+    """
+    Store a JPEG of every RECIPE_IMAGE_VARIANTS size of image `name`, then
+    mark them ready unless the recipe got another image in the meantime.
+    JPEGs are decoded at the smallest scale still covering the largest
+    variant, and each variant is resized from the previous, larger one.
+
+    Replacing the image or deleting the recipe schedules delete_image(),
+    which may run while the variants are still being written. The
+    variants are only marked ready if the recipe still has this image
+    once they are all saved; otherwise they are deleted here, so files
+    written after delete_image() ran don't stay behind.
+    """
+    try:
+        if not Recipe.objects.filter(pk=recipe_id, image=name).exists():
+            return
+        sizes = sorted(
+            settings.RECIPE_IMAGE_VARIANTS.items(),
+            key=lambda item: item[1], reverse=True,
+        )
+        largest = sizes[0][1]
+        with default_storage.open(name) as source:
+            image = Image.open(source)
+            image.draft('RGB', (largest, largest))
+            # The variants don't keep the EXIF data, apply its orientation
+            image = ImageOps.exif_transpose(image).convert('RGB')
+
+        for variant, size in sizes:
+            image.thumbnail((size, size), Image.LANCZOS)
+            output = BytesIO()
+            image.save(
+                output, 'JPEG', optimize=True, progressive=True,
+                quality=settings.RECIPE_IMAGE_VARIANT_QUALITY,
+            )
+            # Overwrite the leftovers of an earlier, interrupted attempt
+            default_storage.delete(variant_name(name, variant))
+            default_storage.save(
+                variant_name(name, variant), ContentFile(output.getvalue())
+            )
+
+        ready = Recipe.objects.filter(pk=recipe_id, image=name).update(
+            image_variants_ready=True
+        )
+        if not ready:
+            delete_image(name)
+    except Exception:
+        logger.exception('Creating the variants of %s failed', name)
+    finally:
+        if settings.RECIPE_IMAGE_ASYNC:
+            connection.close()
+
+
+def delete_image(name):
+    """Delete an image and its variants from the storage"""
+    default_storage.delete(name)
+    for variant in settings.RECIPE_IMAGE_VARIANTS:
+        default_storage.delete(variant_name(name, variant))
+
+
+def schedule(function, *args):
+    """Run `function` in the image worker pool, or now if not async"""
+    if settings.RECIPE_IMAGE_ASYNC:
+        image_executor.submit(function, *args)
+    else:
+        function(*args)
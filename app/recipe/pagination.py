@@ -0,0 +1,221 @@
+import base64
+import json
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginate by filtering on the last seen values of the ordering rather
+    than using an offset, so every page is a range scan over an index such
+    as (user, name, id) no matter how deep the client pages. The ordering
+    of the queryset is used when it has one, `ordering` otherwise. Cursors
+    carry the ordering they were issued for and are rejected under any
+    other.
+    """
+    ordering = ('-name', '-id')
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = _('Invalid cursor')
+
+    def __init__(self):
+        self.page_size = settings.RECIPE_PAGE_SIZE
+        self.max_page_size = settings.RECIPE_MAX_PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        self.page_ordering = tuple(queryset.query.order_by) or self.ordering
+        page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request, queryset.model)
+
+        ordering = self.get_ordering(reverse)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.get_keyset_filter(
+                ordering, position
+            ))
+
+        results = list(queryset[:page_size + 1])
+        has_more = len(results) > page_size
+        results = results[:page_size]
+        if reverse:
+            results.reverse()
+
+        self.has_next = not reverse and has_more or (
+            reverse and position is not None
+        )
+        self.has_previous = reverse and has_more or (
+            not reverse and position is not None
+        )
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, reverse):
+        """Return the ordering, flipping every field when paging back"""
+        if not reverse:
+            return self.page_ordering
+        return tuple(
+            field[1:] if field.startswith('-') else '-' + field
+            for field in self.page_ordering
+        )
+
+    def get_keyset_filter(self, ordering, position):
+        """
+        Build the filter selecting rows after `position`, e.g. for
+        ('-name', '-id'): name < x OR (name = x AND id < y)
+        """
+        keyset_filter = Q()
+        for index, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition = Q(**{'{}__{}'.format(name, lookup): position[index]})
+            for previous, value in zip(ordering[:index], position):
+                condition &= Q(**{previous.lstrip('-'): value})
+            keyset_filter |= condition
+        return keyset_filter
+
+    def get_position(self, instance):
+        return [
+            getattr(instance, field.lstrip('-'))
+            for field in self.page_ordering
+        ]
+
+    def decode_cursor(self, request, model):
+        """
+        Return the position and direction encoded in the cursor, with every
+        position value converted to the type of its ordering field
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            position, reverse = data['p'], bool(data['r'])
+            ordering = data['o']
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if ordering != self.get_ordering_key() or \
+                not isinstance(position, list) or \
+                len(position) != len(self.page_ordering):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            position = [
+                model._meta.get_field(field.lstrip('-')).to_python(value)
+                for field, value in zip(self.page_ordering, position)
+            ]
+        except ValidationError:
+            raise NotFound(self.invalid_cursor_message)
+        if None in position:
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def get_ordering_key(self):
+        return ','.join(self.page_ordering)
+
+    def encode_cursor(self, position, reverse):
+        data = json.dumps({
+            'o': self.get_ordering_key(), 'p': position, 'r': int(reverse),
+        })
+        encoded = base64.urlsafe_b64encode(data.encode()).decode()
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded
+        )
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.get_position(self.page[-1]), False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.get_position(self.page[0]), True)
+
+
+class RecipePagination(KeysetPagination):
+    """Keyset pagination over the (user, id) index, newest first"""
+    ordering = ('-id',)
+
+
+class SearchPagination(BasePagination):
+    """
+    Offset pagination without a count for ranked search results. Clients
+    rarely read past the first pages of a ranking, and skipping the count
+    keeps every page to a single query.
+    """
+    offset_query_param = 'offset'
+    page_size_query_param = 'page_size'
+
+    get_page_size = KeysetPagination.get_page_size
+
+    def __init__(self):
+        self.page_size = settings.RECIPE_PAGE_SIZE
+        self.max_page_size = settings.RECIPE_MAX_PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        try:
+            self.offset = max(
+                0, int(request.query_params[self.offset_query_param])
+            )
+        except (KeyError, ValueError):
+            self.offset = 0
+
+        results = list(queryset[self.offset:self.offset + self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        return results[:self.page_size]
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.base_url, self.offset_query_param,
+            self.offset + self.page_size,
+        )
+
+    def get_previous_link(self):
+        if self.offset <= 0:
+            return None
+        offset = max(0, self.offset - self.page_size)
+        if not offset:
+            return remove_query_param(self.base_url, self.offset_query_param)
+        return replace_query_param(
+            self.base_url, self.offset_query_param, offset
+        )
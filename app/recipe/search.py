@@ -0,0 +1,58 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import Case, CharField, F, FloatField, Value, When
+
+from core.models import Recipe, Tag, Ingredient
+
+
+# Must match the configuration of the search_vector triggers
+SEARCH_CONFIG = 'english'
+
+# Model, result type and the field shown as the result's name
+SEARCHED = (
+    (Recipe, 'recipe', 'title'),
+    (Tag, 'tag', 'name'),
+    (Ingredient, 'ingredient', 'name'),
+)
+
+
+def search(user, text):
+    """
+    Return the user's recipes, tags and ingredients matching `text` as
+    rows of (id, name, type, rank), best match first, in one query.
+    PostgreSQL matches the stored search vectors, other databases fall
+    back to a substring match ranked by how much of the name matches.
+    """
+    if connection.vendor == 'postgresql':
+        match = match_search_vector
+    else:
+        match = match_name
+    querysets = []
+    for model, kind, field in SEARCHED:
+        queryset, rank = match(model.objects.filter(user=user), field, text)
+        querysets.append(queryset.annotate(
+            label=F(field),
+            type=Value(kind, output_field=CharField()),
+            rank=rank,
+        ).values_list('id', 'label', 'type', 'rank'))
+    return querysets[0].union(*querysets[1:], all=True).order_by(
+        '-rank', 'type', '-id'
+    )
+
+
+def match_search_vector(queryset, field, text):
+    """Filter with the GIN indexed search vector, rank with ts_rank"""
+    query = SearchQuery(text, config=SEARCH_CONFIG)
+    rank = SearchRank(F('search_vector'), query)
+    return queryset.filter(search_vector=query), rank
+
+
+def match_name(queryset, field, text):
+    """Filter on a substring, rank whole and prefix matches higher"""
+    rank = Case(
+        When(**{field + '__iexact': text}, then=Value(1.0)),
+        When(**{field + '__istartswith': text}, then=Value(0.5)),
+        default=Value(0.25),
+        output_field=FloatField(),
+    )
+    return queryset.filter(**{field + '__icontains': text}), rank
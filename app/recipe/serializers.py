@@ -1,18 +1,175 @@
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.utils.translation import gettext_lazy as _
+
 from rest_framework import serializers
-from core.models import Tag, Ingredient
+from rest_framework.settings import api_settings
+
+from core.metrics import TimedSerializerMixin
+from core.models import Tag, Ingredient, Recipe
+
+from recipe.images import variant_name
+
+
+class BulkCreateListSerializer(TimedSerializerMixin,
+                               serializers.ListSerializer):
+    """
+    Validate every item on its own and insert the valid ones with a single
+    bulk_create, keeping the errors of the rest in `item_errors`
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('allow_empty', False)
+        super().__init__(*args, **kwargs)
+        self.item_errors = []
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list) or not data:
+            # Let ListSerializer reject anything but a non-empty list
+            return super().to_internal_value(data)
+
+        max_size = settings.RECIPE_BULK_CREATE_MAX_SIZE
+        if len(data) > max_size:
+            message = _('Ensure this list has no more than {} items.')
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [message.format(max_size)]
+            }, code='max_length')
+
+        validated = []
+        self.item_errors = []
+        for item in data:
+            try:
+                validated.append(self.child.run_validation(item))
+            except serializers.ValidationError as exc:
+                self.item_errors.append(exc.detail)
+            else:
+                self.item_errors.append({})
 
+        if not validated:
+            raise serializers.ValidationError(self.item_errors)
 
-class TagSerializer(serializers.ModelSerializer):
+        return validated
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        objs = [model(**attrs) for attrs in validated_data]
+
+        with transaction.atomic():
+            if connection.features.can_return_ids_from_bulk_insert:
+                return model.objects.bulk_create(objs)
+            # Without RETURNING the ids of the new rows would be unknown
+            for obj in objs:
+                obj.save()
+        return objs
+
+    def get_item_results(self):
+        """Return the created item or None for every submitted item"""
+        created = iter(self.data)
+        return [
+            None if errors else next(created) for errors in self.item_errors
+        ]
+
+
+class TagSerializer(TimedSerializerMixin, serializers.ModelSerializer):
 
     class Meta:
         model = Tag
-        fields = ('id', 'name')
-        read_only_fields = ('id',)
+        fields = ('id', 'name', 'usage_count')
+        read_only_fields = ('id', 'usage_count')
+        list_serializer_class = BulkCreateListSerializer
 
 
-class IngredientSerializer(serializers.ModelSerializer):
+class IngredientSerializer(TimedSerializerMixin,
+                           serializers.ModelSerializer):
 
     class Meta:
         model = Ingredient
-        fields = ('id', 'name')
+        fields = ('id', 'name', 'usage_count')
+        read_only_fields = ('id', 'usage_count')
+        list_serializer_class = BulkCreateListSerializer
+
+
+class UserPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Primary key field only accepting objects of the requesting user"""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(
+            user=self.context['request'].user
+        )
+
+
+class ImageVariantsField(serializers.Field):
+    """
+    URLs of the pre-sized variants of a recipe's image by name, empty
+    until they have been created
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.update(source='*', read_only=True)
+        super().__init__(**kwargs)
+
+    def to_representation(self, recipe):
+        if not recipe.image or not recipe.image_variants_ready:
+            return {}
+        request = self.context.get('request')
+        urls = {}
+        for variant in settings.RECIPE_IMAGE_VARIANTS:
+            url = default_storage.url(variant_name(recipe.image.name, variant))
+            if request is not None:
+                url = request.build_absolute_uri(url)
+            urls[variant] = url
+        return urls
+
+
+class RecipeSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """Serialize a recipe with the ids of its tags and ingredients"""
+    ingredients = UserPrimaryKeyRelatedField(
+        many=True,
+        queryset=Ingredient.objects.all(),
+    )
+    tags = UserPrimaryKeyRelatedField(
+        many=True,
+        queryset=Tag.objects.all(),
+    )
+    image_variants = ImageVariantsField()
+
+    class Meta:
+        model = Recipe
+        fields = (
+            'id', 'title', 'ingredients', 'tags', 'time_minutes', 'price',
+            'link', 'image', 'image_variants',
+        )
+        read_only_fields = ('id', 'image')
+
+
+class RecipeDetailSerializer(RecipeSerializer):
+    """Serialize a recipe with its tags and ingredients"""
+    ingredients = IngredientSerializer(many=True, read_only=True)
+    tags = TagSerializer(many=True, read_only=True)
+
+
+class RecipeImageSerializer(serializers.ModelSerializer):
+    """Serialize the image uploaded to a recipe"""
+    image_variants = ImageVariantsField()
+
+    class Meta:
+        model = Recipe
+        fields = ('id', 'image', 'image_variants')
         read_only_fields = ('id',)
+        extra_kwargs = {'image': {'required': True, 'allow_null': False}}
+
+    def validate_image(self, image):
+        """
+        Reject images with more than RECIPE_IMAGE_MAX_PIXELS pixels. A
+        small file can hold a huge image, and the variants are made from
+        the decoded image.
+        """
+        width, height = image.image.size
+        max_pixels = settings.RECIPE_IMAGE_MAX_PIXELS
+        if width * height > max_pixels:
+            message = _('Ensure this image has no more than {} pixels.')
+            raise serializers.ValidationError(
+                message.format(max_pixels), code='max_pixels'
+            )
+        return image
@@ -0,0 +1,75 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Tag, Ingredient
+
+
+TAGS_URL = reverse('recipe:tag-list')
+INGREDIENTS_URL = reverse('recipe:ingredient-list')
+
+
+class BulkCreateApiTests(TestCase):
+    """Test creating tags and ingredients from a JSON array"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='test@example.com',
+            password='test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_bulk_create_tags(self):
+        payload = [{'name': 'vegan'}, {'name': 'dessert'}]
+
+        response = self.client.post(TAGS_URL, payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        names = [item['name'] for item in response.data['results']]
+        self.assertEqual(names, ['vegan', 'dessert'])
+        self.assertEqual(response.data['errors'], [{}, {}])
+        self.assertEqual(
+            Tag.objects.filter(user=self.user).count(), len(payload)
+        )
+
+    def test_bulk_create_partial_failure(self):
+        """Test valid items are created and invalid ones reported"""
+        payload = [{'name': 'salt'}, {'name': ''}, {'name': 'pepper'}]
+
+        response = self.client.post(INGREDIENTS_URL, payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        results = response.data['results']
+        self.assertEqual(results[0]['name'], 'salt')
+        self.assertIsNone(results[1])
+        self.assertEqual(results[2]['name'], 'pepper')
+        self.assertIn('name', response.data['errors'][1])
+        self.assertEqual(
+            Ingredient.objects.filter(user=self.user).count(), 2
+        )
+
+    def test_bulk_create_all_invalid(self):
+        payload = [{'name': ''}, {}]
+
+        response = self.client.post(TAGS_URL, payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Tag.objects.exists())
+
+    def test_bulk_create_empty_list(self):
+        response = self.client.post(TAGS_URL, [], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(RECIPE_BULK_CREATE_MAX_SIZE=2)
+    def test_bulk_create_too_many_items(self):
+        payload = [{'name': 'a'}, {'name': 'b'}, {'name': 'c'}]
+
+        response = self.client.post(TAGS_URL, payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Tag.objects.exists())
@@ -0,0 +1,111 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Tag, CollectionVersion
+
+
+TAGS_URL = reverse('recipe:tag-list')
+INGREDIENTS_URL = reverse('recipe:ingredient-list')
+
+
+class ConditionalGetTests(TestCase):
+    """Test answering unchanged list requests with 304 Not Modified"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='test@example.com',
+            password='test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.tag = Tag.objects.create(user=self.user, name='vegan')
+        cache.clear()
+
+    def test_unchanged_list_not_modified(self):
+        """Test a matching ETag skips the list query"""
+        response = self.client.get(TAGS_URL)
+        etag = response['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.client.get(TAGS_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_no_last_modified(self):
+        """Test only the ETag validates, writes can share a second"""
+        response = self.client.get(INGREDIENTS_URL)
+        self.assertNotIn('Last-Modified', response)
+
+        response = self.client.get(
+            INGREDIENTS_URL,
+            HTTP_IF_MODIFIED_SINCE='Sat, 01 Jan 2100 00:00:00 GMT'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_does_not_write(self):
+        """Test listing a never changed collection doesn't create a row"""
+        with self.assertNumQueries(2):
+            self.client.get(INGREDIENTS_URL)
+
+        self.assertFalse(CollectionVersion.objects.filter(
+            user=self.user, collection='ingredient'
+        ).exists())
+
+    def test_first_create_changes_etag(self):
+        etag = self.client.get(INGREDIENTS_URL)['ETag']
+        self.client.post(INGREDIENTS_URL, {'name': 'salt'})
+
+        response = self.client.get(INGREDIENTS_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_create_changes_etag(self):
+        etag = self.client.get(TAGS_URL)['ETag']
+        self.client.post(TAGS_URL, {'name': 'dessert'})
+
+        response = self.client.get(TAGS_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_bulk_create_changes_etag(self):
+        etag = self.client.get(INGREDIENTS_URL)['ETag']
+        self.client.post(INGREDIENTS_URL, [{'name': 'salt'}], format='json')
+
+        response = self.client.get(INGREDIENTS_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_delete_changes_etag(self):
+        etag = self.client.get(TAGS_URL)['ETag']
+        self.tag.delete()
+
+        response = self.client.get(TAGS_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [])
+
+    def test_etag_differs_per_page(self):
+        etag = self.client.get(TAGS_URL)['ETag']
+
+        response = self.client.get(
+            TAGS_URL, {'page_size': 1}, HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_deleting_user_with_tags(self):
+        """Test cascading deletes don't recreate the collection version"""
+        self.client.get(TAGS_URL)
+
+        self.user.delete()
+
+        self.assertFalse(Tag.objects.exists())
+        self.assertFalse(CollectionVersion.objects.exists())
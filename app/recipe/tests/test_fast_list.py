@@ -0,0 +1,44 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from core.models import Tag, Ingredient
+
+
+TAGS_URL = reverse('recipe:tag-list')
+INGREDIENTS_URL = reverse('recipe:ingredient-list')
+
+
+@override_settings(RECIPE_LIST_CACHE_ALIAS='')
+class FastListSerializationTests(TestCase):
+    """Test the values_list() fast path renders like the serializers"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='test@example.com',
+            password='test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        for name in ['vegan', 'crème "brûlée"', 'line\u2028separator']:
+            Tag.objects.create(user=self.user, name=name)
+            Ingredient.objects.create(user=self.user, name=name)
+
+    def assert_same_output(self, url, params=None):
+        with override_settings(RECIPE_FAST_LIST_SERIALIZATION=False):
+            expected = self.client.get(url, params)
+        with override_settings(RECIPE_FAST_LIST_SERIALIZATION=True):
+            response = self.client.get(url, params)
+
+        self.assertEqual(response.content, expected.content)
+
+    def test_tags_identical(self):
+        self.assert_same_output(TAGS_URL)
+
+    def test_ingredients_identical(self):
+        self.assert_same_output(INGREDIENTS_URL)
+
+    def test_next_page_identical(self):
+        self.assert_same_output(TAGS_URL, {'page_size': 1})
@@ -0,0 +1,154 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Recipe, Tag, Ingredient
+
+
+RECIPES_URL = reverse('recipe:recipe-list')
+TAGS_URL = reverse('recipe:tag-list')
+INGREDIENTS_URL = reverse('recipe:ingredient-list')
+
+
+class RecipeFilterTests(TestCase):
+    """Test filtering recipes by tags and ingredients"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='test@example.com',
+            password='test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        self.vegan = Tag.objects.create(user=self.user, name='Vegan')
+        self.quick = Tag.objects.create(user=self.user, name='Quick')
+        self.tofu = Ingredient.objects.create(user=self.user, name='Tofu')
+
+        self.curry = self.create_recipe('Curry', [self.vegan, self.quick])
+        self.salad = self.create_recipe('Salad', [self.vegan], [self.tofu])
+        self.steak = self.create_recipe('Steak', [self.quick])
+        self.soup = self.create_recipe('Soup')
+
+    def create_recipe(self, title, tags=(), ingredients=()):
+        recipe = Recipe.objects.create(
+            user=self.user, title=title, time_minutes=10, price=5
+        )
+        recipe.tags.set(tags)
+        recipe.ingredients.set(ingredients)
+        return recipe
+
+    def get_titles(self, params):
+        response = self.client.get(RECIPES_URL, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(recipe['title'] for recipe in response.data['results'])
+
+    def test_filter_all_tags(self):
+        ids = '{},{}'.format(self.vegan.id, self.quick.id)
+
+        self.assertEqual(self.get_titles({'tags': ids}), ['Curry'])
+
+    def test_filter_any_tags(self):
+        ids = '{},{}'.format(self.vegan.id, self.quick.id)
+
+        self.assertEqual(
+            self.get_titles({'tags': ids, 'match': 'any'}),
+            ['Curry', 'Salad', 'Steak'],
+        )
+
+    def test_filter_duplicate_ids(self):
+        ids = '{0},{0}'.format(self.vegan.id)
+
+        self.assertEqual(self.get_titles({'tags': ids}), ['Curry', 'Salad'])
+
+    def test_filter_tags_and_ingredients(self):
+        self.assertEqual(self.get_titles({
+            'tags': str(self.vegan.id),
+            'ingredients': str(self.tofu.id),
+        }), ['Salad'])
+
+    def test_filter_single_query(self):
+        """Test filtering adds no queries to the page and its prefetches"""
+        with self.assertNumQueries(3):
+            response = self.client.get(RECIPES_URL, {
+                'tags': '{},{}'.format(self.vegan.id, self.quick.id),
+                'ingredients': str(self.tofu.id),
+                'match': 'any',
+            })
+
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_invalid_filters(self):
+        for params in [{'tags': 'a,b'}, {'tags': '1', 'match': 'some'}]:
+            response = self.client.get(RECIPES_URL, params)
+
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST
+            )
+
+
+class AssignedOnlyTests(TestCase):
+    """Test listing only tags and ingredients assigned to recipes"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='test@example.com',
+            password='test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.recipe = Recipe.objects.create(
+            user=self.user, title='Toast', time_minutes=5, price=1
+        )
+
+    def test_assigned_only(self):
+        for model, url, relation in [
+            (Tag, TAGS_URL, self.recipe.tags),
+            (Ingredient, INGREDIENTS_URL, self.recipe.ingredients),
+        ]:
+            assigned = model.objects.create(user=self.user, name='Bread')
+            model.objects.create(user=self.user, name='Butter')
+            relation.add(assigned)
+
+            response = self.client.get(url, {'assigned_only': 1})
+
+            names = [item['name'] for item in response.data['results']]
+            self.assertEqual(names, ['Bread'])
+
+    def test_assigned_only_unique(self):
+        tag = Tag.objects.create(user=self.user, name='Breakfast')
+        other = Recipe.objects.create(
+            user=self.user, title='Eggs', time_minutes=5, price=1
+        )
+        self.recipe.tags.add(tag)
+        other.tags.add(tag)
+
+        response = self.client.get(TAGS_URL, {'assigned_only': 1})
+
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_assigned_only_after_linking(self):
+        """Test linking a tag changes the list's ETag"""
+        tag = Tag.objects.create(user=self.user, name='Breakfast')
+        response = self.client.get(TAGS_URL, {'assigned_only': 1})
+        self.assertEqual(response.data['results'], [])
+
+        self.recipe.tags.add(tag)
+        response = self.client.get(
+            TAGS_URL, {'assigned_only': 1},
+            HTTP_IF_NONE_MATCH=response['ETag'],
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+
+        self.recipe.delete()
+        response = self.client.get(
+            TAGS_URL, {'assigned_only': 1},
+            HTTP_IF_NONE_MATCH=response['ETag'],
+        )
+
+        self.assertEqual(response.data['results'], [])
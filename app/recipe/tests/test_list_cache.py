@@ -0,0 +1,76 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Tag, Ingredient
+
+from recipe.cache import list_cache
+
+
+TAGS_URL = reverse('recipe:tag-list')
+INGREDIENTS_URL = reverse('recipe:ingredient-list')
+
+
+class ListCacheTests(TestCase):
+    """Test caching the rendered tag and ingredient lists"""
+
+    def setUp(self):
+        cache.clear()
+        list_cache.reset_stats()
+        self.user = get_user_model().objects.create_user(
+            email='test@example.com',
+            password='test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        Tag.objects.create(user=self.user, name='vegan')
+
+    def test_second_request_served_from_cache(self):
+        first = self.client.get(TAGS_URL)
+
+        with self.assertNumQueries(1):
+            second = self.client.get(TAGS_URL)
+
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(list_cache.stats(), {'hits': 1, 'misses': 1})
+
+    def test_create_invalidates_cache(self):
+        self.client.get(TAGS_URL)
+        self.client.post(TAGS_URL, {'name': 'dessert'})
+
+        response = self.client.get(TAGS_URL)
+
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_model_change_invalidates_cache(self):
+        """Test changes made outside the API, e.g. the admin, invalidate"""
+        ingredient = Ingredient.objects.create(user=self.user, name='salt')
+        self.client.get(INGREDIENTS_URL)
+        ingredient.name = 'pepper'
+        ingredient.save()
+
+        response = self.client.get(INGREDIENTS_URL)
+
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['name'], 'pepper')
+
+    def test_cache_is_per_user(self):
+        self.client.get(TAGS_URL)
+        user2 = get_user_model().objects.create_user(
+            email='test2@example.com',
+            password='test123'
+        )
+        self.client.force_authenticate(user2)
+
+        response = self.client.get(TAGS_URL)
+
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'], [])
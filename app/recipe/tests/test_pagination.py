@@ -0,0 +1,96 @@
+import base64
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Tag, Ingredient
+
+
+TAGS_URL = reverse('recipe:tag-list')
+INGREDIENTS_URL = reverse('recipe:ingredient-list')
+
+
+@override_settings(RECIPE_PAGE_SIZE=2, RECIPE_MAX_PAGE_SIZE=3)
+class KeysetPaginationTests(TestCase):
+    """Test paging through tags and ingredients"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='test@example.com',
+            password='test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def collect_pages(self, url):
+        """Follow next links and return the names of every page"""
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages.append([item['name'] for item in response.data['results']])
+            url = response.data['next']
+        return pages
+
+    def test_pages_cover_all_tags_in_order(self):
+        """Test duplicate names are paged by id without gaps"""
+        for name in ['a', 'b', 'b', 'b', 'c']:
+            Tag.objects.create(user=self.user, name=name)
+
+        pages = self.collect_pages(TAGS_URL)
+
+        self.assertEqual(pages, [['c', 'b'], ['b', 'b'], ['a']])
+
+    def test_previous_link_returns_previous_page(self):
+        for name in ['a', 'b', 'c', 'd', 'e']:
+            Ingredient.objects.create(user=self.user, name=name)
+        first = self.client.get(INGREDIENTS_URL)
+        second = self.client.get(first.data['next'])
+
+        response = self.client.get(second.data['previous'])
+
+        self.assertIsNone(first.data['previous'])
+        self.assertEqual(response.data['results'], first.data['results'])
+
+    def test_page_size_is_limited(self):
+        for name in ['a', 'b', 'c', 'd', 'e']:
+            Tag.objects.create(user=self.user, name=name)
+
+        response = self.client.get(TAGS_URL, {'page_size': 10})
+
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(TAGS_URL, {'cursor': 'invalid'})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_with_invalid_value(self):
+        """Test cursor values that don't fit their field are rejected"""
+        for position in (['a', 'notint'], ['a', None], ['a', [1]]):
+            cursor = base64.urlsafe_b64encode(
+                json.dumps({'o': '-name,-id', 'p': position, 'r': 0}).encode()
+            ).decode()
+
+            response = self.client.get(TAGS_URL, {'cursor': cursor})
+
+            self.assertEqual(
+                response.status_code, status.HTTP_404_NOT_FOUND
+            )
+
+    def test_cursor_of_other_ordering(self):
+        """Test a cursor is only accepted under the ordering it came from"""
+        for name in ['a', 'b', 'c']:
+            Tag.objects.create(user=self.user, name=name)
+        response = self.client.get(TAGS_URL, {'ordering': '-usage_count'})
+
+        response = self.client.get(
+            response.data['next'].replace('ordering=-usage_count', '')
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
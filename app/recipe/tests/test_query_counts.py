@@ -0,0 +1,154 @@
+from itertools import count
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings, skipUnlessDBFeature
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from core.models import Tag, Ingredient, Recipe
+from core.tests.utils import QueryCountMixin
+
+
+TAGS_URL = reverse('recipe:tag-list')
+INGREDIENTS_URL = reverse('recipe:ingredient-list')
+TAGS_AUTOCOMPLETE_URL = reverse('recipe:tag-autocomplete')
+RECIPES_URL = reverse('recipe:recipe-list')
+
+
+@override_settings(RECIPE_LIST_CACHE_ALIAS='')
+class RecipeQueryCountTests(QueryCountMixin, TestCase):
+    """Pin the number of queries of every recipe endpoint"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='test@example.com',
+            password='test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.names = count()
+
+    def seed(self, model):
+        def create(number):
+            model.objects.bulk_create([
+                model(user=self.user, name='name {}'.format(next(self.names)))
+                for _ in range(number)
+            ])
+        return create
+
+    def test_tag_list(self):
+        """Collection version and page"""
+        self.assertConstantQueries(
+            2, lambda: self.client.get(TAGS_URL), self.seed(Tag)
+        )
+
+    def test_ingredient_list(self):
+        self.assertConstantQueries(
+            2, lambda: self.client.get(INGREDIENTS_URL), self.seed(Ingredient)
+        )
+
+    def test_tag_list_next_page(self):
+        Tag.objects.create(user=self.user, name='first')
+        Tag.objects.create(user=self.user, name='second')
+
+        def request():
+            first = self.client.get(TAGS_URL, {'page_size': 1})
+            return self.client.get(first.data['next'])
+
+        # first page counts too
+        self.assertConstantQueries(4, request, self.seed(Tag))
+
+    @override_settings(RECIPE_LIST_CACHE_ALIAS='default')
+    def test_tag_list_cached(self):
+        """Collection version only, the cold request renders the page"""
+        self.assertConstantQueries(
+            1, lambda: self.client.get(TAGS_URL), self.seed(Tag), cold=2
+        )
+
+    def test_tag_autocomplete(self):
+        self.assertConstantQueries(
+            1,
+            lambda: self.client.get(TAGS_AUTOCOMPLETE_URL, {'q': 'name'}),
+            self.seed(Tag)
+        )
+
+    def test_tag_create(self):
+        """
+        Insert and collection version bump. The user's first tag also
+        creates the collection version: select, savepoint, insert and
+        release.
+        """
+        self.assertConstantQueries(
+            2,
+            lambda: self.client.post(
+                TAGS_URL, {'name': 'new {}'.format(next(self.names))}
+            ),
+            self.seed(Tag),
+            cold=6,
+        )
+
+    @skipUnlessDBFeature('can_return_ids_from_bulk_insert')
+    def test_ingredient_bulk_create(self):
+        """
+        Savepoint, bulk insert, release and collection version bump. The
+        user's first ingredients also create the collection version:
+        select, savepoint, insert and release.
+        """
+        payload = [{'name': 'salt'}, {'name': 'pepper'}, {'name': 'sage'}]
+        self.assertConstantQueries(
+            4,
+            lambda: self.client.post(INGREDIENTS_URL, payload, format='json'),
+            self.seed(Ingredient),
+            cold=8,
+        )
+
+
+class RecipeListQueryCountTests(QueryCountMixin, TestCase):
+    """Pin the number of queries of the recipe endpoints"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='test@example.com',
+            password='test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.names = count()
+
+    def create_recipe(self, relations=2):
+        """Create a recipe with `relations` new tags and ingredients"""
+        recipe = Recipe.objects.create(
+            user=self.user, title='recipe', time_minutes=5, price=5
+        )
+        self.add_relations(recipe, relations)
+        return recipe
+
+    def add_relations(self, recipe, number):
+        for _ in range(number):
+            name = 'name {}'.format(next(self.names))
+            recipe.tags.add(Tag.objects.create(user=self.user, name=name))
+            recipe.ingredients.add(
+                Ingredient.objects.create(user=self.user, name=name)
+            )
+
+    def test_recipe_list(self):
+        """Page, tags and ingredients of the page"""
+        def seed(number):
+            for _ in range(number):
+                self.create_recipe()
+
+        self.create_recipe()
+        self.assertConstantQueries(
+            3, lambda: self.client.get(RECIPES_URL), seed
+        )
+
+    def test_recipe_detail(self):
+        """Recipe, its tags and its ingredients"""
+        recipe = self.create_recipe(relations=0)
+        url = reverse('recipe:recipe-detail', args=[recipe.id])
+
+        self.assertConstantQueries(
+            3, lambda: self.client.get(url),
+            lambda number: self.add_relations(recipe, number)
+        )
@@ -0,0 +1,304 @@
+import importlib
+import os
+import shutil
+import tempfile
+from io import BytesIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from django.urls import clear_url_caches, reverse
+
+from PIL import Image
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Recipe
+
+from app import urls_api
+from recipe.images import create_variants, delete_image, variant_name
+
+
+# EXIF tag of the rotation cameras store instead of rotating the pixels
+ORIENTATION = 0x0112
+
+
+def image_upload_url(recipe_id):
+    """Return URL for recipe image upload"""
+    return reverse('recipe:recipe-upload-image', args=[recipe_id])
+
+
+def detail_url(recipe_id):
+    """Return recipe detail URL"""
+    return reverse('recipe:recipe-detail', args=[recipe_id])
+
+
+def sample_image(size=(2000, 1000), format='JPEG', name='image.jpg',
+                 orientation=None):
+    """Return an in memory image file ready to be uploaded"""
+    image_file = BytesIO()
+    image = Image.new('RGB', size, color=(200, 80, 20))
+    exif = image.getexif()
+    if orientation is not None:
+        exif[ORIENTATION] = orientation
+    image.save(image_file, format, exif=exif.tobytes())
+    image_file.name = name
+    image_file.seek(0)
+    return image_file
+
+
+class RecipeImageUploadTests(TestCase):
+    """Test uploading and serving recipe images"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings = override_settings(
+            MEDIA_ROOT=self.media_root, RECIPE_IMAGE_ASYNC=False
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.user = get_user_model().objects.create_user(
+            email='test@example.com',
+            password='test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.recipe = Recipe.objects.create(
+            user=self.user, title='Sample recipe', time_minutes=10, price=5
+        )
+
+    def upload(self, image_file):
+        return self.client.post(
+            image_upload_url(self.recipe.id),
+            {'image': image_file},
+            format='multipart',
+        )
+
+    def test_upload_image(self):
+        response = self.upload(sample_image())
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertIn('image', response.data)
+        self.recipe.refresh_from_db()
+        self.assertTrue(default_storage.exists(self.recipe.image.name))
+        self.assertTrue(self.recipe.image_variants_ready)
+
+    def test_upload_creates_variants(self):
+        self.upload(sample_image())
+
+        self.recipe.refresh_from_db()
+        with self.settings(
+            RECIPE_IMAGE_VARIANTS={'small': 160, 'large': 1280}
+        ):
+            response = self.client.get(detail_url(self.recipe.id))
+            self.assertEqual(
+                set(response.data['image_variants']), {'small', 'large'}
+            )
+            for variant, size in (('small', 160), ('large', 1280)):
+                name = variant_name(self.recipe.image.name, variant)
+                self.assertTrue(
+                    response.data['image_variants'][variant].endswith(name)
+                )
+                with default_storage.open(name) as variant_file:
+                    image = Image.open(variant_file)
+                    self.assertEqual(image.format, 'JPEG')
+                    self.assertEqual(image.size, (size, size // 2))
+
+    def test_variants_follow_exif_orientation(self):
+        """Test a photo taken in portrait gets portrait variants"""
+        self.upload(sample_image(orientation=6))
+
+        self.recipe.refresh_from_db()
+        name = variant_name(self.recipe.image.name, 'small')
+        with default_storage.open(name) as variant_file:
+            image = Image.open(variant_file)
+            self.assertEqual(image.size, (80, 160))
+
+    def test_variants_missing_until_ready(self):
+        with self.settings(RECIPE_IMAGE_ASYNC=True), \
+                patch('recipe.images.image_executor') as executor:
+            response = self.upload(sample_image())
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertTrue(executor.submit.called)
+        response = self.client.get(detail_url(self.recipe.id))
+        self.assertTrue(response.data['image'])
+        self.assertEqual(response.data['image_variants'], {})
+
+    def test_upload_invalid_image(self):
+        text = BytesIO(b'not an image')
+        text.name = 'image.jpg'
+
+        response = self.upload(text)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.recipe.refresh_from_db()
+        self.assertFalse(self.recipe.image)
+
+    def test_upload_too_large(self):
+        with self.settings(RECIPE_IMAGE_MAX_SIZE=1000):
+            response = self.upload(sample_image())
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        )
+        self.recipe.refresh_from_db()
+        self.assertFalse(self.recipe.image)
+        self.assertEqual(os.listdir(self.media_root), [])
+
+    def test_upload_too_many_pixels(self):
+        """Test a small file decoding to a huge image is rejected"""
+        image_file = BytesIO()
+        Image.new('1', (12000, 12000)).save(image_file, 'PNG')
+        image_file.name = 'image.png'
+        image_file.seek(0)
+        self.assertLess(len(image_file.getvalue()), 100 * 1024)
+
+        response = self.upload(image_file)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.recipe.refresh_from_db()
+        self.assertFalse(self.recipe.image)
+
+    def test_upload_above_max_pixels(self):
+        with self.settings(RECIPE_IMAGE_MAX_PIXELS=1000 * 1000):
+            response = self.upload(sample_image(size=(2000, 1000)))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('pixels', str(response.data['image']))
+
+    def test_upload_too_large_refused_before_reading(self):
+        with self.settings(
+            RECIPE_IMAGE_MAX_SIZE=1000, DATA_UPLOAD_MAX_MEMORY_SIZE=100
+        ), patch(
+            'core.uploads.MaxSizeUploadHandler.receive_data_chunk'
+        ) as receive_data_chunk:
+            response = self.upload(sample_image())
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        )
+        self.assertFalse(receive_data_chunk.called)
+
+    def test_replace_image_deletes_old_files(self):
+        self.upload(sample_image())
+        self.recipe.refresh_from_db()
+        old_image = self.recipe.image.name
+
+        self.upload(sample_image(size=(300, 300)))
+
+        self.recipe.refresh_from_db()
+        self.assertNotEqual(self.recipe.image.name, old_image)
+        self.assertFalse(default_storage.exists(old_image))
+        self.assertFalse(
+            default_storage.exists(variant_name(old_image, 'small'))
+        )
+        self.assertTrue(default_storage.exists(
+            variant_name(self.recipe.image.name, 'small')
+        ))
+
+    def test_variants_of_replaced_image_cleaned_up(self):
+        """Test variants saved after the old files were deleted are removed"""
+        self.upload(sample_image())
+        self.recipe.refresh_from_db()
+        old_image = self.recipe.image.name
+        Recipe.objects.filter(pk=self.recipe.pk).update(
+            image_variants_ready=False
+        )
+        save = default_storage.save
+
+        def save_while_replaced(name, content):
+            # A new upload replaces the image and deletes the old files
+            # before this variant is written
+            if Recipe.objects.filter(image=old_image).update(
+                image='uploads/recipe/new.jpg'
+            ):
+                delete_image(old_image)
+            return save(name, content)
+
+        with patch.object(default_storage, 'save', save_while_replaced):
+            create_variants(self.recipe.pk, old_image)
+
+        self.assertEqual(os.listdir(os.path.join(
+            self.media_root, 'uploads', 'recipe'
+        )), [])
+        self.recipe.refresh_from_db()
+        self.assertFalse(self.recipe.image_variants_ready)
+
+    def test_variants_of_deleted_recipe_not_created(self):
+        self.upload(sample_image())
+        self.recipe.refresh_from_db()
+        image = self.recipe.image.name
+        self.recipe.delete()
+        delete_image(image)
+
+        create_variants(self.recipe.pk, image)
+
+        self.assertFalse(default_storage.exists(variant_name(image, 'small')))
+
+    def test_delete_recipe_deletes_image(self):
+        self.upload(sample_image())
+        self.recipe.refresh_from_db()
+        image = self.recipe.image.name
+
+        self.client.delete(detail_url(self.recipe.id))
+
+        self.assertFalse(default_storage.exists(image))
+        self.assertFalse(default_storage.exists(variant_name(image, 'small')))
+
+    def test_upload_other_users_recipe(self):
+        other = get_user_model().objects.create_user(
+            email='other@example.com',
+            password='test123'
+        )
+        recipe = Recipe.objects.create(
+            user=other, title='Other recipe', time_minutes=5, price=1
+        )
+
+        response = self.client.post(
+            image_upload_url(recipe.id),
+            {'image': sample_image()},
+            format='multipart',
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_serve_variant_cacheable(self):
+        self.upload(sample_image())
+        self.recipe.refresh_from_db()
+        url = default_storage.url(
+            variant_name(self.recipe.image.name, 'small')
+        )
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        cache_control = response['Cache-Control']
+        self.assertIn('public', cache_control)
+        self.assertIn('immutable', cache_control)
+        self.assertIn('max-age=31536000', cache_control)
+        response.close()
+
+    def test_serve_missing_file(self):
+        response = self.client.get('/media/uploads/recipe/missing.jpg')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_media_not_served_without_serve_media(self):
+        """Test uploads are left to the web server unless SERVE_MEDIA"""
+        self.addCleanup(clear_url_caches)
+        self.addCleanup(importlib.reload, urls_api)
+        with self.settings(SERVE_MEDIA=False):
+            importlib.reload(urls_api)
+            names = [
+                getattr(pattern, 'name', None)
+                for pattern in urls_api.urlpatterns
+            ]
+            self.assertNotIn('media', names)
@@ -0,0 +1,76 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Tag, Ingredient
+
+
+TAGS_URL = reverse('recipe:tag-list')
+TAGS_AUTOCOMPLETE_URL = reverse('recipe:tag-autocomplete')
+INGREDIENTS_AUTOCOMPLETE_URL = reverse('recipe:ingredient-autocomplete')
+
+
+class SearchApiTests(TestCase):
+    """Test name prefix search and autocomplete"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='test@example.com',
+            password='test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list_search_by_prefix(self):
+        for name in ['Vegan', 'vegetarian', 'dessert', 'Avegan']:
+            Tag.objects.create(user=self.user, name=name)
+
+        response = self.client.get(TAGS_URL, {'search': 'veg'})
+
+        names = [tag['name'] for tag in response.data['results']]
+        self.assertEqual(names, ['vegetarian', 'Vegan'])
+
+    def test_autocomplete(self):
+        for name in ['Salt', 'sage', 'pepper']:
+            Ingredient.objects.create(user=self.user, name=name)
+
+        response = self.client.get(INGREDIENTS_AUTOCOMPLETE_URL, {'q': 'sa'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        names = [ingredient['name'] for ingredient in response.data]
+        self.assertEqual(names, ['sage', 'Salt'])
+
+    @override_settings(RECIPE_AUTOCOMPLETE_MAX_LIMIT=2)
+    def test_autocomplete_limit(self):
+        for name in ['a1', 'a2', 'a3']:
+            Tag.objects.create(user=self.user, name=name)
+
+        response = self.client.get(TAGS_AUTOCOMPLETE_URL, {'q': 'a'})
+        limited = self.client.get(
+            TAGS_AUTOCOMPLETE_URL, {'q': 'a', 'limit': 1}
+        )
+
+        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(limited.data), 1)
+
+    def test_autocomplete_limited_to_user(self):
+        user2 = get_user_model().objects.create_user(
+            email='test2@example.com',
+            password='test123'
+        )
+        Tag.objects.create(user=user2, name='vegan')
+
+        response = self.client.get(TAGS_AUTOCOMPLETE_URL, {'q': 'veg'})
+
+        self.assertEqual(response.data, [])
+
+    def test_autocomplete_escapes_wildcards(self):
+        Tag.objects.create(user=self.user, name='50% off')
+        Tag.objects.create(user=self.user, name='500 grams')
+
+        response = self.client.get(TAGS_AUTOCOMPLETE_URL, {'q': '50%'})
+
+        self.assertEqual([tag['name'] for tag in response.data], ['50% off'])
@@ -0,0 +1,91 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Recipe, Tag, Ingredient
+
+
+SEARCH_URL = reverse('recipe:search')
+
+
+class SearchApiTests(TestCase):
+    """Test searching recipes, tags and ingredients together"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='test@example.com',
+            password='test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_recipe(self, title, user=None):
+        return Recipe.objects.create(
+            user=user or self.user, title=title, time_minutes=5, price=1
+        )
+
+    def test_search_required(self):
+        response = self.client.get(SEARCH_URL, {'q': ' '})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_auth_required(self):
+        response = APIClient().get(SEARCH_URL, {'q': 'curry'})
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_search_mixed_results(self):
+        recipe = self.create_recipe('Green curry')
+        tag = Tag.objects.create(user=self.user, name='Curry')
+        ingredient = Ingredient.objects.create(
+            user=self.user, name='Curry paste'
+        )
+        Tag.objects.create(user=self.user, name='Dessert')
+
+        response = self.client.get(SEARCH_URL, {'q': 'curry'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = [
+            (result['type'], result['id'])
+            for result in response.data['results']
+        ]
+        self.assertCountEqual(results, [
+            ('recipe', recipe.id),
+            ('tag', tag.id),
+            ('ingredient', ingredient.id),
+        ])
+        ranks = [result['rank'] for result in response.data['results']]
+        self.assertEqual(ranks, sorted(ranks, reverse=True))
+
+    def test_search_limited_to_user(self):
+        other = get_user_model().objects.create_user(
+            email='other@example.com',
+            password='test123'
+        )
+        self.create_recipe('Curry', user=other)
+        Tag.objects.create(user=other, name='Curry')
+
+        response = self.client.get(SEARCH_URL, {'q': 'curry'})
+
+        self.assertEqual(response.data['results'], [])
+
+    def test_search_pages(self):
+        for i in range(5):
+            self.create_recipe('Soup {}'.format(i))
+
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                SEARCH_URL, {'q': 'soup', 'page_size': 2}
+            )
+        ids = [result['id'] for result in response.data['results']]
+        self.assertIsNone(response.data['previous'])
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            ids.extend(result['id'] for result in response.data['results'])
+
+        self.assertEqual(len(ids), 5)
+        self.assertEqual(len(set(ids)), 5)
+        self.assertIsNotNone(response.data['previous'])
@@ -52,7 +52,7 @@ class PrivateTagApiTests(TestCase):
         # 2.4 check if response contains any data
         tags = Tag.objects.all().order_by('-name')
         serializer = TagSerializer(tags, many=True)
-        self.assertEqual(response.data, serializer.data)
+        self.assertEqual(response.data['results'], serializer.data)
 
     # 3 check if response contains only user's data
     def test_api_list_limited_to_user(self):
@@ -69,9 +69,9 @@ class PrivateTagApiTests(TestCase):
         response = self.client.get(TAGS_URL)
         # 3.5 check api only contains old user tags
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['name'], tag2.name)
-        self.assertFalse(response.data[0]['name'] == tag1.name)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['name'], tag2.name)
+        self.assertFalse(response.data['results'][0]['name'] == tag1.name)
 
     # 3. test api creates items if users authenticated
     def test_create_tag_successful(self):
@@ -131,10 +131,10 @@ class TestIngredientApiPrivate(TestCase):
         # 6.3.1 check if status code is HTTP_200_OK
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         # 6.3.2 check if there is ingredient in the data
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data['results']), 1)
         ingredients = Ingredient.objects.all().order_by('-name')
         serializer = IngredientSerializer(ingredients, many=True)
-        self.assertEqual(response.data, serializer.data)
+        self.assertEqual(response.data['results'], serializer.data)
 
     # 6.4 check if user can only see his/her ingredient
     def test_api_list_limited_to_user(self):
@@ -155,9 +155,10 @@ class TestIngredientApiPrivate(TestCase):
         # 6.4.3 check response only contains user's ingredient
         response = self.client.get(INGREDIENTS_URL)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['name'], ingredient1.name)
-        self.assertFalse(response.data[0]['name'] == ingredient2.name)
+        results = response.data['results']
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]['name'], ingredient1.name)
+        self.assertFalse(results[0]['name'] == ingredient2.name)
 
     # 6.5 Test ingredient creation endpoint
     def test_create_ingredient_successful(self):
@@ -0,0 +1,160 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Recipe, Tag, Ingredient
+
+
+TAGS_URL = reverse('recipe:tag-list')
+INGREDIENTS_URL = reverse('recipe:ingredient-list')
+
+
+class UsageCountTests(TestCase):
+    """Test usage_count follows links between recipes and tags"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='test@example.com',
+            password='test123'
+        )
+        self.tags = [
+            Tag.objects.create(user=self.user, name=name)
+            for name in ['Vegan', 'Quick', 'Dessert']
+        ]
+        self.recipe = self.create_recipe()
+
+    def create_recipe(self):
+        return Recipe.objects.create(
+            user=self.user, title='Recipe', time_minutes=5, price=1
+        )
+
+    def assertCounts(self, expected):
+        counts = [
+            Tag.objects.get(pk=tag.pk).usage_count for tag in self.tags
+        ]
+        self.assertEqual(counts, expected)
+
+    def test_add_and_remove(self):
+        vegan, quick, dessert = self.tags
+        self.recipe.tags.add(vegan, quick)
+        self.recipe.tags.add(vegan)
+        self.create_recipe().tags.add(vegan)
+        self.assertCounts([2, 1, 0])
+
+        self.recipe.tags.remove(quick, dessert)
+        self.assertCounts([2, 0, 0])
+
+        self.recipe.tags.set([dessert])
+        self.assertCounts([1, 0, 1])
+
+        self.recipe.tags.clear()
+        self.assertCounts([1, 0, 0])
+
+    def test_reverse_relation(self):
+        vegan = self.tags[0]
+        other = self.create_recipe()
+        vegan.recipe_set.add(self.recipe, other)
+        self.assertCounts([2, 0, 0])
+
+        vegan.recipe_set.remove(other, other)
+        self.assertCounts([1, 0, 0])
+
+        vegan.recipe_set.clear()
+        self.assertCounts([0, 0, 0])
+
+    def test_delete_recipe(self):
+        ingredient = Ingredient.objects.create(user=self.user, name='Salt')
+        self.recipe.tags.add(self.tags[0])
+        self.recipe.ingredients.add(ingredient)
+
+        self.recipe.delete()
+
+        self.assertCounts([0, 0, 0])
+        ingredient.refresh_from_db()
+        self.assertEqual(ingredient.usage_count, 0)
+
+    def test_recount_usage(self):
+        self.recipe.tags.add(*self.tags)
+        Tag.objects.filter(pk=self.tags[0].pk).update(usage_count=5)
+        Tag.objects.filter(pk=self.tags[2].pk).update(usage_count=0)
+        out = StringIO()
+
+        call_command('recount_usage', batch_size=2, stdout=out)
+
+        self.assertCounts([1, 1, 1])
+        self.assertIn('Fixed usage_count of 2 tags', out.getvalue())
+        self.assertIn('Fixed usage_count of 0 ingredients', out.getvalue())
+
+    def test_recount_usage_changes_etag(self):
+        """Test corrected counts aren't served from cached lists"""
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.recipe.tags.add(*self.tags)
+        Tag.objects.filter(pk=self.tags[0].pk).update(usage_count=5)
+        response = client.get(TAGS_URL)
+        etag = response['ETag']
+
+        call_command('recount_usage', stdout=StringIO())
+
+        response = client.get(TAGS_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {tag['usage_count'] for tag in response.data['results']}, {1}
+        )
+
+
+class UsageOrderingTests(TestCase):
+    """Test listing tags and ingredients by usage"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='test@example.com',
+            password='test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_order_by_usage(self):
+        for model, url in [(Tag, TAGS_URL), (Ingredient, INGREDIENTS_URL)]:
+            for name, usage_count in [('a', 1), ('b', 3), ('c', 0)]:
+                model.objects.create(
+                    user=self.user, name=name, usage_count=usage_count
+                )
+
+            response = self.client.get(url, {'ordering': '-usage_count'})
+
+            names = [item['name'] for item in response.data['results']]
+            self.assertEqual(names, ['b', 'a', 'c'])
+            self.assertEqual(response.data['results'][0]['usage_count'], 3)
+
+    def test_order_by_usage_pages(self):
+        for i in range(5):
+            Tag.objects.create(
+                user=self.user, name='tag {}'.format(i), usage_count=i % 2
+            )
+        expected = list(Tag.objects.order_by(
+            '-usage_count', '-id'
+        ).values_list('name', flat=True))
+
+        names = []
+        response = self.client.get(
+            TAGS_URL, {'ordering': '-usage_count', 'page_size': 2}
+        )
+        while True:
+            names.extend(tag['name'] for tag in response.data['results'])
+            if response.data['next'] is None:
+                break
+            response = self.client.get(response.data['next'])
+
+        self.assertEqual(names, expected)
+
+    def test_invalid_ordering(self):
+        response = self.client.get(TAGS_URL, {'ordering': 'user'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -7,9 +7,11 @@ from recipe import views
 router = DefaultRouter()
 router.register('tags', views.TagViewSet)
 router.register('ingredients', views.IngredientViewSet)
+router.register('recipes', views.RecipeViewSet)
 
 app_name = 'recipe'
 
 urlpatterns = [
+    path('search/', views.SearchView.as_view(), name='search'),
     path('', include(router.urls))
 ]
@@ -1,40 +1,337 @@
-from rest_framework import viewsets, mixins
-from rest_framework.authentication import TokenAuthentication
+import hashlib
+
+from django.conf import settings
+from django.db.models import Count, Exists, OuterRef, Prefetch
+from django.db.models.functions import Upper
+from django.http import HttpResponse
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+)
+from django.utils.http import quote_etag
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import generics, viewsets, mixins, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
-from core.models import Tag, Ingredient
+from core.authentication import CachedTokenAuthentication
+from core.metrics import timer
+from core.models import Tag, Ingredient, Recipe, CollectionVersion
+from core.uploads import MaxSizeUploadHandler
 
-from recipe.serializers import TagSerializer, IngredientSerializer
+from recipe.cache import list_cache
+from recipe.images import create_variants, delete_image, schedule
+from recipe.pagination import (
+    KeysetPagination, RecipePagination, SearchPagination,
+)
+from recipe.search import search
+from recipe import serializers
 
 
-class TagViewSet(viewsets.GenericViewSet,
-                 mixins.ListModelMixin,
-                 mixins.CreateModelMixin):
-    """Manage tags in the database"""
-    authentication_classes = (TokenAuthentication,)
+class BaseRecipeAttrViewSet(viewsets.GenericViewSet,
+                            mixins.ListModelMixin,
+                            mixins.CreateModelMixin):
+    """Base viewset for the user owned recipe attributes"""
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (IsAuthenticated,)
-    queryset = Tag.objects.all()
-    serializer_class = TagSerializer
+    pagination_class = KeysetPagination
+    # ?ordering= values, each backed by a (user, ..., id) index
+    orderings = {
+        '-name': ('-name', '-id'),
+        '-usage_count': ('-usage_count', '-id'),
+    }
 
     def get_queryset(self):
-        return self.queryset.filter(user=self.request.user).order_by('-name')
+        queryset = self.queryset.filter(user=self.request.user)
+        search = self.request.query_params.get('search')
+        if search:
+            queryset = queryset.filter(name__istartswith=search)
+        if self.request.query_params.get('assigned_only') in ('1', 'true'):
+            queryset = queryset.annotate(
+                assigned=Exists(self.get_recipe_links())
+            ).filter(assigned=True)
+
+        ordering = self.request.query_params.get('ordering', '-name')
+        if ordering not in self.orderings:
+            raise ValidationError({'ordering': [
+                _('Must be one of {}.').format(', '.join(self.orderings))
+            ]})
+        return queryset.order_by(*self.orderings[ordering])
+
+    def get_recipe_links(self):
+        """Return the links of the current object to recipes"""
+        field = self.recipe_field
+        return field.remote_field.through.objects.filter(**{
+            field.m2m_reverse_field_name(): OuterRef('pk'),
+        })
+
+    def get_collection_etag(self):
+        """
+        Return the ETag of the requested page, derived from the version of
+        the user's collection. No Last-Modified is sent: its one second
+        resolution can't tell apart writes made in the same second.
+        """
+        version, updated_at = CollectionVersion.objects.get_version(
+            self.request.user.id, self.queryset.model._meta.model_name
+        )
+        key = '{}:{}:{}:{}:{}'.format(
+            self.request.user.id,
+            version,
+            updated_at.isoformat() if updated_at else '',
+            self.request.accepted_renderer.format,
+            self.request.get_full_path(),
+        )
+        return quote_etag(hashlib.md5(key.encode()).hexdigest())
+
+    def list(self, request, *args, **kwargs):
+        """List the objects, answering conditional requests with a 304"""
+        etag = self.get_collection_etag()
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = self.get_list_response(etag)
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def get_list_response(self, etag):
+        """Serve the rendered list from the cache or render and store it"""
+        cacheable = list_cache.enabled and \
+            self.request.accepted_renderer.format == 'json'
+        if not cacheable:
+            return self.list_page()
+
+        cached = list_cache.get(etag)
+        if cached is not None:
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        response = self.list_page()
+        response['X-Cache'] = 'MISS'
+        response.add_post_render_callback(
+            lambda rendered: list_cache.set(etag, rendered)
+        )
+        return response
+
+    def list_page(self):
+        """
+        Return the requested page. Unless disabled with
+        RECIPE_FAST_LIST_SERIALIZATION, rows are fetched with values_list()
+        and turned into dicts directly, which gives the same output as the
+        serializer for plain model fields without instantiating models or
+        running every field's to_representation().
+        """
+        if not settings.RECIPE_FAST_LIST_SERIALIZATION:
+            return super().list(self.request)
+
+        fields = self.get_serializer_class().Meta.fields
+        queryset = self.get_queryset().values_list(*fields, named=True)
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            page = list(queryset)
+        with timer('serialize'):
+            data = [row._asdict() for row in page]
+        if self.paginator is None:
+            return Response(data)
+        return self.get_paginated_response(data)
+
+    @action(detail=False)
+    def autocomplete(self, request):
+        """Return the first objects whose name starts with `q`"""
+        prefix = request.query_params.get('q', '')
+        try:
+            limit = int(request.query_params['limit'])
+        except (KeyError, ValueError):
+            limit = settings.RECIPE_AUTOCOMPLETE_LIMIT
+        limit = max(1, min(limit, settings.RECIPE_AUTOCOMPLETE_MAX_LIMIT))
+
+        # On PostgreSQL the text_pattern_ops index (0007) finds the prefix
+        # matches, but only returns them in UPPER(name) order under the C
+        # collation; the plain UPPER(name) index (0014) gives the planner an
+        # ordered scan that stops after `limit` rows for common prefixes
+        rows = self.queryset.filter(
+            user=request.user,
+            name__istartswith=prefix,
+        ).order_by(Upper('name')).values_list(
+            *self.get_serializer_class().Meta.fields, named=True
+        )
+        rows = list(rows[:limit])
+        with timer('serialize'):
+            data = [row._asdict() for row in rows]
+        return Response(data)
+
+    def create(self, request, *args, **kwargs):
+        """Create a single object, or all valid objects of a JSON array"""
+        if not isinstance(request.data, list):
+            return super().create(request, *args, **kwargs)
+
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        # bulk_create doesn't send post_save, see core.signals
+        CollectionVersion.objects.bump(
+            request.user.id, self.queryset.model._meta.model_name,
+            create=True,
+        )
+
+        errors = serializer.item_errors
+        response_status = status.HTTP_201_CREATED
+        if any(errors):
+            response_status = status.HTTP_207_MULTI_STATUS
+        return Response({
+            'results': serializer.get_item_results(),
+            'errors': errors,
+        }, status=response_status)
 
     def perform_create(self, serializer):
-        """Create a new tag"""
         serializer.save(user=self.request.user)
 
 
-class IngredientViewSet(viewsets.GenericViewSet,
-                        mixins.ListModelMixin,
-                        mixins.CreateModelMixin):
+class TagViewSet(BaseRecipeAttrViewSet):
+    """Manage tags in the database"""
+    queryset = Tag.objects.all()
+    serializer_class = serializers.TagSerializer
+    recipe_field = Recipe._meta.get_field('tags')
+
+
+class IngredientViewSet(BaseRecipeAttrViewSet):
     """Manage ingredients in the database"""
-    authentication_classes = (TokenAuthentication,)
-    permission_classes = (IsAuthenticated,)
     queryset = Ingredient.objects.all()
-    serializer_class = IngredientSerializer
+    serializer_class = serializers.IngredientSerializer
+    recipe_field = Recipe._meta.get_field('ingredients')
+
+
+class RecipeViewSet(viewsets.ModelViewSet):
+    """Manage recipes in the database"""
+    queryset = Recipe.objects.all()
+    serializer_class = serializers.RecipeSerializer
+    authentication_classes = (CachedTokenAuthentication,)
+    permission_classes = (IsAuthenticated,)
+    pagination_class = RecipePagination
 
     def get_queryset(self):
-        return self.queryset.filter(user=self.request.user).order_by('-name')
+        """
+        Retrieve the user's recipes, loading the tags and ingredients of
+        all recipes on a page with one query each
+        """
+        queryset = self.queryset.filter(user=self.request.user)
+        match = self.request.query_params.get('match', 'all')
+        if match not in ('all', 'any'):
+            raise ValidationError({'match': [_('Must be "all" or "any".')]})
+        for name in ('tags', 'ingredients'):
+            ids = self.get_id_list(name)
+            if ids:
+                queryset = queryset.filter(
+                    pk__in=self.get_matching_recipes(name, ids, match)
+                )
+
+        return queryset.prefetch_related(
+            Prefetch('tags', queryset=Tag.objects.order_by('name', 'id')),
+            Prefetch(
+                'ingredients',
+                queryset=Ingredient.objects.order_by('name', 'id'),
+            ),
+        ).order_by('-id')
+
+    def get_id_list(self, name):
+        """Parse a comma separated list of ids from the query string"""
+        value = self.request.query_params.get(name)
+        if not value:
+            return []
+        try:
+            return sorted({int(id_) for id_ in value.split(',')})
+        except ValueError:
+            raise ValidationError({
+                name: [_('Must be a comma separated list of ids.')]
+            })
+
+    def get_matching_recipes(self, name, ids, match):
+        """
+        Return the ids of recipes linked to all or any of `ids` through the
+        `name` relation. Both read only the link table's (object, recipe)
+        index; matching all groups the links by recipe and keeps those
+        with one link per id.
+        """
+        field = Recipe._meta.get_field(name)
+        recipe_id = field.m2m_column_name()
+        links = field.remote_field.through.objects.filter(**{
+            field.m2m_reverse_name() + '__in': ids,
+        })
+        if match == 'any':
+            return links.values(recipe_id)
+        return links.values(recipe_id).annotate(
+            links=Count(recipe_id)
+        ).filter(links=len(ids)).values(recipe_id)
+
+    def get_serializer_class(self):
+        if self.action == 'retrieve':
+            return serializers.RecipeDetailSerializer
+        if self.action == 'upload_image':
+            return serializers.RecipeImageSerializer
+        return self.serializer_class
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+
+    def perform_destroy(self, instance):
+        image = instance.image.name
+        super().perform_destroy(instance)
+        if image:
+            schedule(delete_image, image)
+
+    @action(methods=['POST'], detail=True, url_path='upload-image',
+            parser_classes=(MultiPartParser,))
+    def upload_image(self, request, pk=None):
+        """
+        Store an image for the recipe and respond right away with 202; the
+        pre-sized variants are created by the image worker pool. Uploads
+        are read in chunks and abandoned beyond RECIPE_IMAGE_MAX_SIZE.
+        """
+        # Must be in place before the body is parsed
+        limit = MaxSizeUploadHandler(
+            request._request, settings.RECIPE_IMAGE_MAX_SIZE
+        )
+        request._request.upload_handlers = \
+            [limit] + request._request.upload_handlers
+
+        recipe = self.get_object()
+        serializer = self.get_serializer(recipe, data=request.data)
+        if limit.exceeded:
+            message = _('Ensure this file is no larger than {} bytes.')
+            return Response(
+                {'image': [message.format(settings.RECIPE_IMAGE_MAX_SIZE)]},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+        serializer.is_valid(raise_exception=True)
+
+        old_image = recipe.image.name
+        recipe = serializer.save(image_variants_ready=False)
+        if old_image:
+            schedule(delete_image, old_image)
+        schedule(create_variants, recipe.pk, recipe.image.name)
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+
+class SearchView(generics.GenericAPIView):
+    """Search the user's recipes, tags and ingredients at once"""
+    authentication_classes = (CachedTokenAuthentication,)
+    permission_classes = (IsAuthenticated,)
+    pagination_class = SearchPagination
+
+    def get(self, request):
+        text = request.query_params.get('q', '').strip()
+        if not text:
+            raise ValidationError({'q': [_('This field is required.')]})
+
+        page = self.paginate_queryset(search(request.user, text))
+        with timer('serialize'):
+            data = [
+                {'type': type_, 'id': id_, 'name': name, 'rank': rank}
+                for id_, name, type_, rank in page
+            ]
+        return self.get_paginated_response(data)
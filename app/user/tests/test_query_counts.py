@@ -0,0 +1,73 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.authentication import token_cache, user_token_cache
+from core.models import Tag
+from core.tests.utils import QueryCountMixin
+
+
+CREATE_USER_URL = reverse('user:create')
+TOKEN_URL = reverse('user:token')
+ME_URL = reverse('user:me')
+
+
+class UserQueryCountTests(QueryCountMixin, TestCase):
+    """Pin the number of queries of every user endpoint"""
+
+    def setUp(self):
+        token_cache.clear()
+        user_token_cache.clear()
+        self.payload = {'email': 'test@example.com', 'password': 'test123'}
+        self.user = get_user_model().objects.create_user(**self.payload)
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+    def tearDown(self):
+        token_cache.clear()
+        user_token_cache.clear()
+
+    def seed_tags(self, number):
+        Tag.objects.bulk_create([
+            Tag(user=self.user, name='tag') for _ in range(number)
+        ])
+
+    def test_create_user(self):
+        """Email uniqueness check and insert"""
+        emails = iter(range(1000))
+        self.assertConstantQueries(2, lambda: self.client.post(
+            CREATE_USER_URL,
+            {'email': 'new{}@example.com'.format(next(emails)),
+             'password': 'test123',
+             'name': 'name'}
+        ), self.seed_tags)
+
+    def test_token(self):
+        """User lookup, the token is cached after the cold lookup"""
+        self.assertConstantQueries(
+            1, lambda: self.client.post(TOKEN_URL, self.payload),
+            self.seed_tags, cold=2
+        )
+
+    def test_retrieve_me(self):
+        """Token and user are cached after the cold lookup"""
+        self.assertConstantQueries(
+            0, lambda: self.client.get(ME_URL), self.seed_tags, cold=1
+        )
+
+    def test_update_me(self):
+        """Token lookup and update of the changed field"""
+        names = iter(range(1000))
+        self.assertConstantQueries(2, lambda: self.client.patch(
+            ME_URL, {'name': 'new name {}'.format(next(names))}
+        ), self.seed_tags)
+
+    def test_update_me_password(self):
+        """Token lookup and a single update of the password"""
+        self.assertConstantQueries(2, lambda: self.client.patch(
+            ME_URL, {'password': 'newpassword123'}
+        ), self.seed_tags)
@@ -1,10 +1,22 @@
-from django.test import TestCase
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 
+from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient
 from rest_framework import status
 
+from core.authentication import (
+    rotate_token,
+    token_cache,
+    user_token_cache,
+)
+
 
 CREATE_USER_URL = reverse("user:create")
 TOKEN_URL = reverse("user:token")
@@ -146,3 +158,135 @@ class PrivateUserApiTests(TestCase):
         self.assertEqual(self.user.name, payload['name'])
         self.assertTrue(self.user.check_password(payload['password']))
         self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+
+class TokenIssueApiTests(TestCase):
+    """Test issuing tokens without redundant queries and writes"""
+
+    def setUp(self):
+        token_cache.clear()
+        user_token_cache.clear()
+        self.payload = {'email': 'test@example.com', 'password': 'test123'}
+        self.user = create_user(**self.payload)
+        self.client = APIClient()
+
+    def tearDown(self):
+        token_cache.clear()
+        user_token_cache.clear()
+
+    def test_token_reused_from_cache(self):
+        """Test a repeated login only looks up the user"""
+        first = self.client.post(TOKEN_URL, self.payload)
+
+        with self.assertNumQueries(1):
+            second = self.client.post(TOKEN_URL, self.payload)
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data['token'], first.data['token'])
+
+    def test_login_does_not_write_last_login(self):
+        """Test logging in for a token keeps the login path read only"""
+        self.client.post(TOKEN_URL, self.payload)
+
+        self.user.refresh_from_db()
+        self.assertIsNone(self.user.last_login)
+
+    @override_settings(TOKEN_EXPIRE_SECONDS=60)
+    def test_expired_token_rotated(self):
+        token = Token.objects.create(user=self.user)
+        Token.objects.filter(pk=token.pk).update(
+            created=timezone.now() - timedelta(minutes=5)
+        )
+
+        response = self.client.post(TOKEN_URL, self.payload)
+
+        self.assertNotEqual(response.data['token'], token.key)
+        self.assertFalse(Token.objects.filter(key=token.key).exists())
+
+    @override_settings(TOKEN_EXPIRE_SECONDS=60)
+    def test_concurrent_rotation(self):
+        """Test logins rotating the same expired token share the new one"""
+        token = Token.objects.create(user=self.user)
+        Token.objects.filter(pk=token.pk).update(
+            created=timezone.now() - timedelta(minutes=5)
+        )
+        # Both logins read the expired token before either rotates it
+        first_read = Token.objects.get(user=self.user)
+        second_read = Token.objects.get(user=self.user)
+
+        first = rotate_token(first_read)
+        second = rotate_token(second_read)
+
+        self.assertNotEqual(first.key, token.key)
+        self.assertEqual(second.key, first.key)
+        self.assertEqual(Token.objects.filter(user=self.user).count(), 1)
+
+    @override_settings(TOKEN_EXPIRE_SECONDS=60)
+    def test_expired_token_rejected(self):
+        token = Token.objects.create(user=self.user)
+        Token.objects.filter(pk=token.pk).update(
+            created=timezone.now() - timedelta(minutes=5)
+        )
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+
+        response = self.client.get(ME_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class UpdateUserApiTests(TestCase):
+    """Test updating the user writes once and drops cached auth state"""
+
+    def setUp(self):
+        token_cache.clear()
+        user_token_cache.clear()
+        self.user = create_user(
+            email='test@example.com', password='test123', name='name'
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+    def tearDown(self):
+        token_cache.clear()
+        user_token_cache.clear()
+
+    def test_update_writes_changed_fields(self):
+        self.client.get(ME_URL)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(ME_URL, {
+                'name': 'new name', 'email': self.user.email,
+            })
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        updates = [
+            query['sql'] for query in queries
+            if query['sql'].startswith('UPDATE')
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"name"', updates[0])
+        self.assertNotIn('"email"', updates[0])
+
+    def test_update_unchanged_skips_write(self):
+        self.client.get(ME_URL)
+
+        with self.assertNumQueries(0):
+            response = self.client.patch(ME_URL, {'name': 'name'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_password_change_invalidates_cache(self):
+        self.client.get(ME_URL)
+        self.client.post(TOKEN_URL, {
+            'email': 'test@example.com', 'password': 'test123'
+        })
+
+        self.client.patch(ME_URL, {'password': 'newpassword123'})
+
+        self.assertIsNone(token_cache.get(self.token.key))
+        self.assertIsNone(user_token_cache.get(self.user.pk))
+        response = self.client.get(ME_URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('newpassword123'))